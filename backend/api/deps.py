@@ -1,17 +1,21 @@
 # backend/api/deps.py
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core import security
 from core.config import settings
-from database import models, database
+from database import database
 from schemas import token as token_schemas
+from schemas import user as user_schemas
 from crud import crud_user
+from crud.aio import crud_user as aio_crud_user
+from crud.user_cache import auth_user_cache
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/api/v1/auth/token" #  Path to the token generation endpoint
@@ -24,10 +28,8 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(reusable_oauth2)
-) -> models.User:
+# Validates the token and returns (email, expiry timestamp)
+def _decode_token(token: str) -> Tuple[str, Optional[float]]:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -44,18 +46,61 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials (email missing in token)",
         )
-    user = crud_user.get_user_by_email(db, email=token_data.email)
+    return token_data.email, payload.get("exp")
+
+# `generation`: auth_user_cache.generation() read before the user was loaded
+def _remember_user(token: str, user, generation: int, token_expires_at: Optional[float]) -> user_schemas.User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    user_snapshot = user_schemas.User.model_validate(user, from_attributes=True)
+    auth_user_cache.put(token, user_snapshot, generation, token_expires_at=token_expires_at)
+    return user_snapshot
+
+# Returns a snapshot of the user (id, email, is_active), not the ORM instance:
+# routes that need to modify the user load it themselves
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(reusable_oauth2)
+) -> user_schemas.User:
+    cached_user = auth_user_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+    email, expires_at = _decode_token(token)
+    generation = auth_user_cache.generation()
+    user = crud_user.get_user_by_email(db, email=email)
+    return _remember_user(token, user, generation, expires_at)
 
 def get_current_active_user(
-    current_user: models.User = Depends(get_current_user)
-) -> models.User:
+    current_user: user_schemas.User = Depends(get_current_user)
+) -> user_schemas.User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+# --- Async variants, used by api/routes/aio when DATABASE_ASYNC_MODE is on ---
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+async def aget_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(reusable_oauth2)
+) -> user_schemas.User:
+    cached_user = auth_user_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+    email, expires_at = _decode_token(token)
+    generation = auth_user_cache.generation()
+    user = await aio_crud_user.get_user_by_email(db, email=email)
+    return _remember_user(token, user, generation, expires_at)
+
+# async def, so FastAPI does not hop to the threadpool just for this check
+async def aget_current_active_user(
+    current_user: user_schemas.User = Depends(aget_current_user)
+) -> user_schemas.User:
+    return get_current_active_user(current_user)
+
 # Dependency for superuser (if you implement roles)
 # def get_current_active_superuser(
 #     current_user: models.User = Depends(get_current_active_user),
@@ -0,0 +1,25 @@
+# backend/api/http_cache.py
+# Helpers for sending pre-rendered JSON with conditional GET (ETag / If-None-Match) support.
+from fastapi import Request, Response, status
+
+from core import pagination
+from crud.menu_cache import RenderedResponse
+
+# Clients may keep the body but must revalidate it with If-None-Match before reuse
+CACHE_CONTROL = "no-cache"
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix sent back by a proxy still matches
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def json_response(request: Request, rendered: RenderedResponse) -> Response:
+    headers = {"ETag": rendered.etag, "Cache-Control": CACHE_CONTROL}
+    if rendered.next_cursor:
+        headers[pagination.NEXT_CURSOR_HEADER] = rendered.next_cursor
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
@@ -0,0 +1,3 @@
+# backend/api/routes/aio/__init__.py
+# Async versions of the routers in api/routes, mounted by main.py instead of the
+# sync ones when DATABASE_ASYNC_MODE is on. Same paths, schemas and behaviour.
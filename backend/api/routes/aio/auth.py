@@ -0,0 +1,91 @@
+# backend/api/routes/aio/auth.py
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import deps
+from core import security
+from core.config import settings
+from crud.aio import crud_user
+from schemas import user as user_schemas
+from schemas import token as token_schemas
+
+router = APIRouter()
+
+@router.post("/token", response_model=token_schemas.Token)
+async def login_for_access_token(
+    db: AsyncSession = Depends(deps.get_async_db),
+    form_data: OAuth2PasswordRequestForm = Depends()
+):
+    """
+    OAuth2 compatible token login, get an access token for future requests.
+    """
+    user = await crud_user.get_user_by_email(db, email=form_data.username) # username is email
+    if not user or not await security.averify_password(form_data.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    elif not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = security.create_access_token(
+        data={"sub": user.email, "email": user.email}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/register", response_model=user_schemas.User, status_code=status.HTTP_201_CREATED)
+async def register_new_user(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    user_in: user_schemas.UserCreate,
+):
+    """
+    Create new user.
+    """
+    if await crud_user.get_user_by_email(db, email=user_in.email):
+        raise HTTPException(
+            status_code=400,
+            detail="The user with this email already exists in the system.",
+        )
+    return await crud_user.create_user(db, user=user_in)
+
+@router.get("/users/me", response_model=user_schemas.User)
+async def read_users_me(
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user),
+):
+    """
+    Get current user.
+    """
+    return current_user
+
+@router.put("/users/me/password", status_code=status.HTTP_200_OK)
+async def change_current_user_password(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    password_data: user_schemas.PasswordChange,
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user),
+):
+    """
+    Change current user's password.
+    """
+    user = await crud_user.get_user(db, user_id=current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not await security.averify_password(password_data.old_password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect old password",
+        )
+    await crud_user.update_password(db, user_id=user.id, new_password=password_data.new_password)
+    return {"message": "Password updated successfully"}
+
+@router.get("/users/me/items")
+async def read_own_items(
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user)
+):
+    return [{"item_id": "Foo", "owner": current_user.email}]
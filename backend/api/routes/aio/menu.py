@@ -0,0 +1,147 @@
+# backend/api/routes/aio/menu.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import deps, http_cache
+from api.routes.menu import (
+    IMPORT_DRY_RUN_DESCRIPTION, IMPORT_REPLACE_DESCRIPTION, RECOMMENDATION_ITEMS_DESCRIPTION, parse_cursor,
+    read_catalog, recommendable_items, render_menu_listing,
+)
+from crud.aio import crud_menu
+from crud.menu_cache import menu_catalog
+from crud.recommendations import recommender
+from schemas import menu as menu_schemas
+
+router = APIRouter()
+
+@router.post("/", response_model=menu_schemas.MenuItem, status_code=status.HTTP_201_CREATED)
+async def create_menu_item(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    menu_item_in: menu_schemas.MenuItemCreate,
+):
+    """
+    Create a new menu item.
+    Potentially restricted to admin/superuser.
+    """
+    if await crud_menu.get_menu_item(db, menu_item_id=menu_item_in.id):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Menu item with ID '{menu_item_in.id}' already exists."
+        )
+    return await crud_menu.create_menu_item(db, menu_item=menu_item_in)
+
+@router.post("/import", response_model=menu_schemas.MenuImportResult)
+async def import_menu(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    items: List[menu_schemas.MenuItemCreate] = Depends(read_catalog),
+    replace: bool = Query(False, description=IMPORT_REPLACE_DESCRIPTION),
+    dry_run: bool = Query(False, description=IMPORT_DRY_RUN_DESCRIPTION),
+):
+    """
+    Create or update menu items from a whole catalog (JSON array, NDJSON or CSV with
+    a header row), in one transaction. Each item replaces the stored one: optional
+    fields it leaves out are cleared. Any invalid row rejects the whole catalog (422).
+    With replace, items that past orders reference are kept and listed as such.
+    Potentially restricted to admin/superuser.
+    """
+    return await crud_menu.import_menu_items(db, items, replace=replace, dry_run=dry_run)
+
+@router.get("/", response_model=List[menu_schemas.MenuItem])
+async def read_menu_items(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; takes precedence over skip"),
+    category: str = Query(None, description="Filter menu items by category"),
+    q: str = Query(None, description="Search query for item name or description"),
+):
+    """
+    Retrieve all menu items, optionally filtered by category or search query.
+    Catalog responses carry an ETag and answer 304 to a matching If-None-Match.
+    Full pages return the cursor of the next page in the X-Next-Cursor header.
+    """
+    after_id = parse_cursor(cursor)
+    snapshot = await menu_catalog.asnapshot(db)
+    rendered = render_menu_listing(snapshot, q, category, skip, limit, after_id)
+    return http_cache.json_response(request, rendered)
+
+@router.get("/suggest", response_model=List[menu_schemas.MenuSuggestion])
+async def suggest_menu_items(
+    db: AsyncSession = Depends(deps.get_async_db),
+    prefix: str = Query(..., description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Autocomplete suggestions (item names and categories) for the search box.
+    """
+    return await menu_catalog.asuggest(db, prefix, limit)
+
+@router.get("/recommendations", response_model=List[menu_schemas.MenuItem])
+async def recommend_menu_items(
+    db: AsyncSession = Depends(deps.get_async_db),
+    items: List[str] = Query([], description=RECOMMENDATION_ITEMS_DESCRIPTION),
+    category: Optional[str] = Query(None, description="Only suggest items of this category, e.g. Bebidas"),
+    limit: int = Query(5, ge=1, le=20),
+):
+    """
+    Items frequently bought together with the cart, for suggestions at checkout.
+    An empty cart (or one with no order history) gets the most popular items.
+    """
+    snapshot = await menu_catalog.asnapshot(db)
+    allowed = recommendable_items(snapshot, category)
+    # run_sync for the query catching up on orders placed through other workers; the
+    # (re)builds of the matrix run in a background thread, off the event loop
+    recommended = await db.run_sync(lambda session: recommender.recommend(session, items, limit=limit, allowed=allowed))
+    return [snapshot.by_id[item_id] for item_id in recommended]
+
+@router.get("/{menu_item_id}", response_model=menu_schemas.MenuItem)
+async def read_menu_item(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    menu_item_id: str,
+):
+    """
+    Get a specific menu item by ID.
+    """
+    snapshot = await menu_catalog.asnapshot(db)
+    menu_item = snapshot.by_id.get(menu_item_id)
+    if not menu_item:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return http_cache.json_response(request, snapshot.render(("item", menu_item_id), lambda: menu_item))
+
+@router.put("/{menu_item_id}", response_model=menu_schemas.MenuItem)
+async def update_menu_item(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    menu_item_id: str,
+    menu_item_in: menu_schemas.MenuItemUpdate,
+):
+    """
+    Update a menu item.
+    Potentially restricted to admin/superuser.
+    """
+    updated_menu_item = await crud_menu.update_menu_item(db, menu_item_id=menu_item_id, menu_item_update=menu_item_in)
+    if not updated_menu_item:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return updated_menu_item
+
+@router.delete("/{menu_item_id}", response_model=menu_schemas.MenuItem)
+async def delete_menu_item(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    menu_item_id: str,
+):
+    """
+    Delete a menu item.
+    Potentially restricted to admin/superuser.
+    """
+    deleted_menu_item = await crud_menu.delete_menu_item(db, menu_item_id=menu_item_id)
+    if not deleted_menu_item:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return deleted_menu_item
@@ -0,0 +1,132 @@
+# backend/api/routes/aio/orders.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import deps
+from api.routes.orders import (
+    CURSOR_DESCRIPTION, IDEMPOTENCY_KEY_DESCRIPTION, ExportFormat,
+    export_response, idempotency_key_reused, idempotency_store_full, parse_cursor, set_next_cursor,
+)
+from core import idempotency
+from core.config import settings
+from crud import order_export
+from crud.aio import crud_order
+from crud.order_batcher import order_batcher
+from schemas import order as order_schemas
+from schemas import user as user_schemas
+
+router = APIRouter()
+
+async def _create_order(db: AsyncSession, order_in: order_schemas.OrderCreate, user_id: int) -> order_schemas.Order:
+    if settings.ORDER_BATCH_ENABLED:
+        return await order_batcher.asubmit(order_in, user_id=user_id)
+    return await crud_order.create_order(db, order=order_in, user_id=user_id)
+
+@router.post("/", response_model=order_schemas.Order, status_code=status.HTTP_201_CREATED)
+async def create_new_order(
+    *,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    order_in: order_schemas.OrderCreate,
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user),
+    idempotency_key: Optional[str] = Header(
+        None, alias=idempotency.IDEMPOTENCY_KEY_HEADER, max_length=idempotency.MAX_KEY_LENGTH,
+        description=IDEMPOTENCY_KEY_DESCRIPTION,
+    ),
+):
+    """
+    Create a new order for the current authenticated user.
+    A retry carrying the Idempotency-Key of an earlier request returns that request's
+    order (with Idempotent-Replayed: true) instead of creating another one.
+    """
+    try:
+        if not idempotency_key:
+            return await _create_order(db, order_in, current_user.id)
+        created = []
+        async def create() -> int:
+            created.append(await _create_order(db, order_in, current_user.id))
+            return created[0].id
+        order_id, replayed = await idempotency.order_idempotency.arun(
+            current_user.id, idempotency_key, idempotency.fingerprint(order_in.model_dump_json()), create
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except idempotency.IdempotencyKeyReused:
+        raise idempotency_key_reused()
+    except idempotency.IdempotencyStoreFull:
+        raise idempotency_store_full()
+    if not replayed:
+        return created[0]
+    response.headers[idempotency.IDEMPOTENT_REPLAYED_HEADER] = "true"
+    order = await crud_order.get_order(db, order_id=order_id)
+    if not order: # Created and since deleted
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    return order
+
+@router.get("/me", response_model=List[order_schemas.Order])
+async def read_my_orders(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+):
+    """
+    Retrieve orders for the current authenticated user, newest first.
+    Full pages return the cursor of the next page in the X-Next-Cursor header.
+    """
+    before_id = parse_cursor(cursor)
+    orders = await crud_order.get_orders_by_user(db, user_id=current_user.id, skip=skip, limit=limit, before_id=before_id)
+    set_next_cursor(response, orders, limit)
+    return orders
+
+@router.get("/all", response_model=List[order_schemas.Order])
+async def read_all_orders(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+):
+    """
+    Retrieve all orders (admin/superuser access).
+    THIS ROUTE SHOULD BE PROTECTED TO ONLY ALLOW ADMINS/SUPERUSERS.
+    """
+    before_id = parse_cursor(cursor)
+    orders = await crud_order.get_orders(db, skip=skip, limit=limit, before_id=before_id)
+    set_next_cursor(response, orders, limit)
+    return orders
+
+@router.get("/export")
+async def export_orders(
+    format: ExportFormat = Query("ndjson", description="ndjson: one order per line; csv: one row per order line"),
+    min_id: Optional[int] = Query(None, description="Lowest order id to include"),
+    max_id: Optional[int] = Query(None, description="Highest order id to include"),
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user),
+    # current_user: models.User = Depends(deps.get_current_active_superuser) # Protect this route
+):
+    """
+    Stream every order in the id range, oldest first, without paging.
+    Requires authentication; SHOULD BE RESTRICTED TO ADMINS/SUPERUSERS.
+    """
+    return export_response(order_export.astream_orders(format, min_id=min_id, max_id=max_id), format)
+
+@router.get("/{order_id}", response_model=order_schemas.Order)
+async def read_order(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    order_id: int,
+    current_user: user_schemas.User = Depends(deps.aget_current_active_user)
+):
+    """
+    Get a specific order by ID, if it belongs to the current user.
+    """
+    order = await crud_order.get_order(db, order_id=order_id)
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    if order.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this order")
+    return order
@@ -0,0 +1,56 @@
+# backend/api/routes/analytics.py
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from api import deps
+from crud import crud_analytics
+from schemas import analytics as analytics_schemas
+from schemas import user as user_schemas
+
+# Dashboard reports (admin, like /orders/all: needs superuser protection). Business
+# data, so they take an authenticated user meanwhile; sync in both modes, so the sync
+# dependency serves the async wiring too.
+# Days are UTC; start and end are inclusive.
+router = APIRouter()
+
+@router.get("/top-sellers", response_model=List[analytics_schemas.TopSeller])
+def read_top_sellers(
+    db: Session = Depends(deps.get_db),
+    start: Optional[date] = Query(None, description="First day (UTC) to include"),
+    end: Optional[date] = Query(None, description="Last day (UTC) to include"),
+    by: Literal["units", "revenue"] = "units",
+    limit: int = Query(10, ge=1, le=100),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user), # TODO: get_current_active_superuser
+):
+    """
+    Best-selling menu items in the period, by units sold or by revenue.
+    """
+    return crud_analytics.get_top_sellers(db, start=start, end=end, limit=limit, by=by)
+
+@router.get("/revenue-by-category", response_model=List[analytics_schemas.CategoryRevenue])
+def read_revenue_by_category(
+    db: Session = Depends(deps.get_db),
+    start: Optional[date] = Query(None, description="First day (UTC) to include"),
+    end: Optional[date] = Query(None, description="Last day (UTC) to include"),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user), # TODO: get_current_active_superuser
+):
+    """
+    Units, revenue and number of orders per menu category in the period.
+    """
+    return crud_analytics.get_revenue_by_category(db, start=start, end=end)
+
+@router.get("/daily-revenue", response_model=List[analytics_schemas.DailyRevenue])
+def read_daily_revenue(
+    db: Session = Depends(deps.get_db),
+    start: Optional[date] = Query(None, description="First day (UTC) to include"),
+    end: Optional[date] = Query(None, description="Last day (UTC) to include"),
+    category: Optional[str] = Query(None, description="Only this menu category"),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user), # TODO: get_current_active_superuser
+):
+    """
+    Units and revenue per day (days without sales are omitted).
+    """
+    return crud_analytics.get_daily_revenue(db, start=start, end=end, category=category)
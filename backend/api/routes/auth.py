@@ -70,31 +70,25 @@ def change_current_user_password(
     *,
     db: Session = Depends(deps.get_db),
     password_data: user_schemas.PasswordChange,
-    current_user: user_schemas.User = Depends(deps.get_current_active_user), # This should be the DB model instance
+    current_user: user_schemas.User = Depends(deps.get_current_active_user),
 ):
     """
     Change current user's password.
     """
+    # current_user is a cached snapshot without hashed_password: load the DB model instance
+    user = crud_user.get_user(db, user_id=current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
     # Verify old password
-    # current_user from get_current_active_user is typically the SQLAlchemy model instance
-    # which includes hashed_password. If it were just a Pydantic schema without hashed_password,
-    # we would need to fetch the user from DB first.
-    # Assuming current_user has hashed_password:
-    if not security.verify_password(password_data.old_password, current_user.hashed_password):
+    if not security.verify_password(password_data.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect old password",
         )
 
-    # Hash the new password
-    hashed_new_password = security.get_password_hash(password_data.new_password)
-
-    # Update user in the database
-    # current_user is assumed to be the SQLAlchemy model instance
-    current_user.hashed_password = hashed_new_password
-    db.add(current_user)
-    db.commit()
-    # db.refresh(current_user) # Not strictly necessary unless there are DB-side changes to refresh
+    # Hash and store the new password; this also drops the user's cached sessions
+    crud_user.update_password(db, user, password_data.new_password)
 
     return {"message": "Password updated successfully"}
 
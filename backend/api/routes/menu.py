@@ -1,16 +1,90 @@
 # backend/api/routes/menu.py
-from typing import List
+from typing import Container, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
-from api import deps
-from crud import crud_menu
+from api import deps, http_cache
+from core import pagination
+from crud import crud_menu, menu_import
+from crud.menu_cache import CatalogSnapshot, RenderedResponse, menu_catalog
+from crud.recommendations import recommender
 from schemas import menu as menu_schemas
 from database import models # For response model if needed, though schemas are preferred
 
 router = APIRouter()
 
+# Helpers shared with the async routes in api/routes/aio/menu.py
+def parse_cursor(cursor: Optional[str]) -> Optional[str]:
+    if cursor is None:
+        return None
+    try:
+        return pagination.decode_cursor("menu", cursor, str)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def render_menu_listing(
+    snapshot: CatalogSnapshot, q: Optional[str], category: Optional[str], skip: int, limit: int, after_id: Optional[str]
+) -> RenderedResponse:
+    if q:
+        # Ranked, accent-insensitive search over the in-memory index of the catalog
+        return snapshot.render(
+            ("search", q, skip, limit, after_id),
+            lambda: snapshot.search_menu_items(q, skip=skip, limit=limit, after_id=after_id),
+            page_limit=limit,
+        )
+    if category:
+        return snapshot.render(
+            ("category", category, skip, limit, after_id),
+            lambda: snapshot.get_menu_items_by_category(category, skip=skip, limit=limit, after_id=after_id),
+            page_limit=limit,
+        )
+    return snapshot.render(
+        ("list", skip, limit, after_id),
+        lambda: snapshot.get_menu_items(skip=skip, limit=limit, after_id=after_id),
+        page_limit=limit,
+    )
+
+def recommendable_items(snapshot: CatalogSnapshot, category: Optional[str]) -> Container[str]:
+    # Only items still on the menu (and in the category, if one is asked for)
+    if category is None:
+        return snapshot.by_id
+    return {item.id for item in snapshot.by_category.get(category, [])}
+
+RECOMMENDATION_ITEMS_DESCRIPTION = "Menu item ids already in the cart (repeat the parameter for each)"
+
+# async so it can read the raw body; the (sync or async) import route then gets the validated items
+async def read_catalog(
+    request: Request,
+    format: Optional[Literal["json", "ndjson", "csv"]] = Query(
+        None, description="Catalog format; by default taken from the Content-Type"
+    ),
+) -> List[menu_schemas.MenuItemCreate]:
+    catalog_format = format or menu_import.format_from_content_type(request.headers.get("content-type"))
+    if catalog_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send the catalog as {', '.join(menu_import.CATALOG_FORMATS.values())} (or pass format)",
+        )
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > menu_import.MAX_CATALOG_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail=f"Catalogs are limited to {menu_import.MAX_CATALOG_BYTES} bytes",
+            )
+    try:
+        return menu_import.parse_catalog(bytes(body), catalog_format)
+    except menu_import.CatalogError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={"invalid_rows": len(exc.errors), "errors": exc.errors[:menu_import.MAX_REPORTED_ERRORS]},
+        )
+
+IMPORT_REPLACE_DESCRIPTION = "Delete the menu items missing from the catalog (except those past orders reference)"
+IMPORT_DRY_RUN_DESCRIPTION = "Only report what the import would change"
+
 @router.post("/", response_model=menu_schemas.MenuItem, status_code=status.HTTP_201_CREATED)
 def create_menu_item(
     *, # Ensures all subsequent arguments are keyword-only
@@ -32,35 +106,87 @@ def create_menu_item(
     menu_item = crud_menu.create_menu_item(db=db, menu_item=menu_item_in)
     return menu_item
 
+@router.post("/import", response_model=menu_schemas.MenuImportResult)
+def import_menu(
+    *,
+    db: Session = Depends(deps.get_db),
+    items: List[menu_schemas.MenuItemCreate] = Depends(read_catalog),
+    replace: bool = Query(False, description=IMPORT_REPLACE_DESCRIPTION),
+    dry_run: bool = Query(False, description=IMPORT_DRY_RUN_DESCRIPTION),
+    # current_user: models.User = Depends(deps.get_current_active_superuser) # If only superusers can import
+):
+    """
+    Create or update menu items from a whole catalog (JSON array, NDJSON or CSV with
+    a header row), in one transaction. Each item replaces the stored one: optional
+    fields it leaves out are cleared. Any invalid row rejects the whole catalog (422).
+    With replace, items that past orders reference are kept and listed as such.
+    Potentially restricted to admin/superuser.
+    """
+    return crud_menu.import_menu_items(db, items, replace=replace, dry_run=dry_run)
+
 @router.get("/", response_model=List[menu_schemas.MenuItem])
 def read_menu_items(
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    category: str = Query(None, description="Filter menu items by category")
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; takes precedence over skip"),
+    category: str = Query(None, description="Filter menu items by category"),
+    q: str = Query(None, description="Search query for item name or description") # Adicionar parâmetro de busca
 ):
     """
-    Retrieve all menu items, optionally filtered by category.
+    Retrieve all menu items, optionally filtered by category or search query.
+    Catalog responses carry an ETag and answer 304 to a matching If-None-Match.
+    Full pages return the cursor of the next page in the X-Next-Cursor header.
     """
-    if category:
-        menu_items = crud_menu.get_menu_items_by_category(db, category=category, skip=skip, limit=limit)
-    else:
-        menu_items = crud_menu.get_menu_items(db, skip=skip, limit=limit)
-    return menu_items
+    after_id = parse_cursor(cursor)
+    snapshot = menu_catalog.snapshot(db)
+    rendered = render_menu_listing(snapshot, q, category, skip, limit, after_id)
+    return http_cache.json_response(request, rendered)
+
+# Declared before /{menu_item_id} so that "suggest" is not taken for an item ID
+@router.get("/suggest", response_model=List[menu_schemas.MenuSuggestion])
+def suggest_menu_items(
+    db: Session = Depends(deps.get_db),
+    prefix: str = Query(..., description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Autocomplete suggestions (item names and categories) for the search box.
+    Served from an in-memory prefix index; no database query while the catalog is cached.
+    """
+    return menu_catalog.suggest(db, prefix=prefix, limit=limit)
+
+@router.get("/recommendations", response_model=List[menu_schemas.MenuItem])
+def recommend_menu_items(
+    db: Session = Depends(deps.get_db),
+    items: List[str] = Query([], description=RECOMMENDATION_ITEMS_DESCRIPTION),
+    category: Optional[str] = Query(None, description="Only suggest items of this category, e.g. Bebidas"),
+    limit: int = Query(5, ge=1, le=20),
+):
+    """
+    Items frequently bought together with the cart, for suggestions at checkout.
+    An empty cart (or one with no order history) gets the most popular items.
+    """
+    snapshot = menu_catalog.snapshot(db)
+    recommended = recommender.recommend(db, items, limit=limit, allowed=recommendable_items(snapshot, category))
+    return [snapshot.by_id[item_id] for item_id in recommended]
 
 @router.get("/{menu_item_id}", response_model=menu_schemas.MenuItem)
 def read_menu_item(
     *, # Ensures all subsequent arguments are keyword-only
+    request: Request,
     db: Session = Depends(deps.get_db),
     menu_item_id: str,
 ):
     """
     Get a specific menu item by ID.
     """
-    menu_item = crud_menu.get_menu_item(db, menu_item_id=menu_item_id)
+    snapshot = menu_catalog.snapshot(db)
+    menu_item = snapshot.by_id.get(menu_item_id)
     if not menu_item:
         raise HTTPException(status_code=404, detail="Menu item not found")
-    return menu_item
+    return http_cache.json_response(request, snapshot.render(("item", menu_item_id), lambda: menu_item))
 
 @router.put("/{menu_item_id}", response_model=menu_schemas.MenuItem)
 def update_menu_item(
@@ -96,22 +222,3 @@ def delete_menu_item(
         raise HTTPException(status_code=404, detail="Menu item not found")
     deleted_menu_item = crud_menu.delete_menu_item(db=db, menu_item_id=menu_item_id)
     return deleted_menu_item
-
-@router.get("/", response_model=List[menu_schemas.MenuItem])
-def read_menu_items(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    category: str = Query(None, description="Filter menu items by category"),
-    q: str = Query(None, description="Search query for item name or description") # Adicionar parâmetro de busca
-):
-    """
-    Retrieve all menu items, optionally filtered by category or search query.
-    """
-    if q:
-        menu_items = crud_menu.search_menu_items(db, query=q, skip=skip, limit=limit)
-    elif category:
-        menu_items = crud_menu.get_menu_items_by_category(db, category=category, skip=skip, limit=limit)
-    else:
-        menu_items = crud_menu.get_menu_items(db, skip=skip, limit=limit)
-    return menu_items
\ No newline at end of file
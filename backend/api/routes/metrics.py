@@ -0,0 +1,96 @@
+# backend/api/routes/metrics.py
+# GET /api/v1/metrics: everything in core.metrics.registry, in the Prometheus text
+# format. The request metrics are recorded by metrics.MetricsMiddleware; the
+# collectors below read the statistics the caches and pools already keep, only when
+# the endpoint is scraped.
+from typing import Callable, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core import metrics
+from core.idempotency import order_idempotency
+from core.security import password_hashing_pool
+from crud.menu_cache import menu_catalog
+from crud.order_batcher import order_batcher
+from crud.user_cache import auth_user_cache
+from database import database
+
+router = APIRouter()
+
+_CACHES: Dict[str, Callable[[], Dict[str, float]]] = {
+    "menu_catalog": menu_catalog.stats,
+    "auth_user": auth_user_cache.stats,
+}
+
+def _engines():
+    yield "sync", database.engine
+    if database.async_engine is not None:
+        yield "async", database.async_engine.sync_engine
+
+def _pool_stat(read: Callable) -> Callable[[], Dict[tuple, float]]:
+    def collect():
+        values = {}
+        for label, engine in _engines():
+            try:
+                values[(label,)] = read(engine.pool)
+            except AttributeError: # Pools without sizing (e.g. in-memory SQLite)
+                continue
+        return values
+    return collect
+
+def _cache_lookups():
+    values = {}
+    for cache, stats in _CACHES.items():
+        current = stats()
+        values[(cache, "hit")] = current["hits"]
+        values[(cache, "miss")] = current["misses"]
+    return values
+
+def _cache_hit_ratio():
+    values = {}
+    for cache, stats in _CACHES.items():
+        current = stats()
+        lookups = current["hits"] + current["misses"]
+        values[(cache,)] = current["hits"] / lookups if lookups else 0.0
+    return values
+
+metrics.registry.callback(
+    "counter", "cache_lookups_total", "Cache lookups by result.", _cache_lookups, ("cache", "result")
+)
+metrics.registry.callback(
+    "gauge", "cache_hit_ratio", "Hits / lookups since the process started.", _cache_hit_ratio, ("cache",)
+)
+metrics.registry.callback(
+    "gauge", "db_pool_checked_out", "Connections currently checked out.",
+    _pool_stat(lambda pool: pool.checkedout()), ("engine",),
+)
+metrics.registry.callback(
+    "gauge", "db_pool_size", "Configured pool size (DB_POOL_SIZE).", _pool_stat(lambda pool: pool.size()), ("engine",)
+)
+metrics.registry.callback(
+    "gauge", "db_pool_overflow", "Connections open beyond the pool size (negative: unused pool slots).",
+    _pool_stat(lambda pool: pool.overflow()), ("engine",),
+)
+metrics.registry.callback(
+    "gauge", "password_hash_in_flight", "bcrypt calls admitted to the hashing pool.",
+    lambda: {(): password_hashing_pool.stats()["in_flight"]},
+)
+metrics.registry.callback(
+    "counter", "password_hash_rejected_total", "bcrypt calls rejected with 503 (pool saturated).",
+    lambda: {(): password_hashing_pool.stats()["rejected"]},
+)
+metrics.registry.callback(
+    "counter", "idempotency_replays_total", "POST /orders requests answered from the idempotency store.",
+    lambda: {(): order_idempotency.stats()["replays"]},
+)
+metrics.registry.callback(
+    "counter", "order_batches_total", "Order batches committed by the group-commit writer.",
+    lambda: {(): order_batcher.stats()["batches"]},
+)
+
+# async def: rendering does no IO, and a scrape should not wait for a threadpool
+# slot when the pool is saturated (which is when the metrics matter most)
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
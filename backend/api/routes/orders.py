@@ -1,52 +1,170 @@
 # backend/api/routes/orders.py
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from api import deps
-from crud import crud_order
+from core import idempotency, pagination
+from core.config import settings
+from crud import crud_order, order_export
+from crud.order_batcher import order_batcher
 from schemas import order as order_schemas
-from database import models # Required for current_user type hint
+from schemas import user as user_schemas
+from database import models # For type hints
 
 router = APIRouter()
 
+CURSOR_DESCRIPTION = "Cursor from the X-Next-Cursor header; takes precedence over skip"
+IDEMPOTENCY_KEY_DESCRIPTION = "Retries with the same key return the order created by the first attempt"
+ExportFormat = Literal["ndjson", "csv"]
+
+# Helpers shared with the async routes in api/routes/aio/orders.py
+def parse_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        return pagination.decode_cursor("orders", cursor, int)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def set_next_cursor(response: Response, orders: List[models.Order], limit: int) -> None:
+    # Newest first, so the next page starts below the last (oldest) id of this one
+    if orders and len(orders) == limit:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = pagination.encode_cursor("orders", orders[-1].id)
+
+def export_response(body, export_format: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=order_export.EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{export_format}"'},
+    )
+
+def idempotency_key_reused() -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail="Idempotency-Key was already used with a different request body",
+    )
+
+def idempotency_store_full() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many orders in progress, please retry shortly.",
+        headers={"Retry-After": str(idempotency.STORE_FULL_RETRY_AFTER_SECONDS)},
+    )
+
+def _create_order(db: Session, order_in: order_schemas.OrderCreate, user_id: int):
+    if settings.ORDER_BATCH_ENABLED:
+        return order_batcher.submit(order_in, user_id=user_id)
+    return crud_order.create_order(db=db, order=order_in, user_id=user_id)
+
 @router.post("/", response_model=order_schemas.Order, status_code=status.HTTP_201_CREATED)
 def create_new_order(
     *, # Ensures all subsequent arguments are keyword-only
+    response: Response,
     db: Session = Depends(deps.get_db),
     order_in: order_schemas.OrderCreate,
-    current_user: models.User = Depends(deps.get_current_active_user)
+    current_user: user_schemas.User = Depends(deps.get_current_active_user),
+    idempotency_key: Optional[str] = Header(
+        None, alias=idempotency.IDEMPOTENCY_KEY_HEADER, max_length=idempotency.MAX_KEY_LENGTH,
+        description=IDEMPOTENCY_KEY_DESCRIPTION,
+    ),
 ):
     """
     Create a new order for the current authenticated user.
+    A retry carrying the Idempotency-Key of an earlier request returns that request's
+    order (with Idempotent-Replayed: true) instead of creating another one.
     """
     try:
-        order = crud_order.create_order(db=db, order=order_in, user_id=current_user.id)
+        if not idempotency_key:
+            return _create_order(db, order_in, current_user.id)
+        created = []
+        def create() -> int:
+            created.append(_create_order(db, order_in, current_user.id))
+            return created[0].id
+        order_id, replayed = idempotency.order_idempotency.run(
+            current_user.id, idempotency_key, idempotency.fingerprint(order_in.model_dump_json()), create
+        )
     except ValueError as e:
         # This catches the ValueError from crud_order if a menu item is not found
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except idempotency.IdempotencyKeyReused:
+        raise idempotency_key_reused()
+    except idempotency.IdempotencyStoreFull:
+        raise idempotency_store_full()
+    if not replayed:
+        return created[0]
+    response.headers[idempotency.IDEMPOTENT_REPLAYED_HEADER] = "true"
+    order = crud_order.get_order(db, order_id=order_id)
+    if not order: # Created and since deleted
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
     return order
 
 @router.get("/me", response_model=List[order_schemas.Order])
 def read_my_orders(
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+):
+    """
+    Retrieve orders for the current authenticated user, newest first.
+    Full pages return the cursor of the next page in the X-Next-Cursor header.
+    """
+    before_id = parse_cursor(cursor)
+    orders = crud_order.get_orders_by_user(db, user_id=current_user.id, skip=skip, limit=limit, before_id=before_id)
+    set_next_cursor(response, orders, limit)
+    return orders
+
+# Admin route to get all orders (example, needs superuser protection)
+# Declared before /{order_id} so that "all" is not parsed as an order id
+@router.get("/all", response_model=List[order_schemas.Order]) # Consider a different path prefix for admin routes
+def read_all_orders(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    # current_user: models.User = Depends(deps.get_current_active_superuser) # Protect this route
 ):
     """
-    Retrieve orders for the current authenticated user.
+    Retrieve all orders (admin/superuser access).
+    THIS ROUTE SHOULD BE PROTECTED TO ONLY ALLOW ADMINS/SUPERUSERS.
     """
-    orders = crud_order.get_orders_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
+    # This is a placeholder for admin functionality. 
+    # Ensure proper authorization (e.g., using get_current_active_superuser) before enabling.
+    # For now, it's commented out in main.py or should raise a 501 Not Implemented.
+    # raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Admin access only")
+    before_id = parse_cursor(cursor)
+    orders = crud_order.get_orders(db, skip=skip, limit=limit, before_id=before_id)
+    set_next_cursor(response, orders, limit)
     return orders
 
+# Admin export (same protection caveat as /all), also declared before /{order_id}.
+# Every user's orders: at least an authenticated user until superusers exist
+@router.get("/export")
+def export_orders(
+    format: ExportFormat = Query("ndjson", description="ndjson: one order per line; csv: one row per order line"),
+    min_id: Optional[int] = Query(None, description="Lowest order id to include"),
+    max_id: Optional[int] = Query(None, description="Highest order id to include"),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user),
+    # current_user: models.User = Depends(deps.get_current_active_superuser) # Protect this route
+):
+    """
+    Stream every order in the id range, oldest first, without paging.
+    Requires authentication; SHOULD BE RESTRICTED TO ADMINS/SUPERUSERS.
+    """
+    return export_response(order_export.stream_orders(format, min_id=min_id, max_id=max_id), format)
+
 @router.get("/{order_id}", response_model=order_schemas.Order)
 def read_order(
     *, # Ensures all subsequent arguments are keyword-only
     db: Session = Depends(deps.get_db),
     order_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user)
+    current_user: user_schemas.User = Depends(deps.get_current_active_user)
 ):
     """
     Get a specific order by ID. 
@@ -61,22 +179,3 @@ def read_order(
         # You might want a more generic "Not authorized" or a specific "Order not found" to avoid leaking info
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this order")
     return order
-
-# Admin route to get all orders (example, needs superuser protection)
-@router.get("/all", response_model=List[order_schemas.Order]) # Consider a different path prefix for admin routes
-def read_all_orders(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    # current_user: models.User = Depends(deps.get_current_active_superuser) # Protect this route
-):
-    """
-    Retrieve all orders (admin/superuser access).
-    THIS ROUTE SHOULD BE PROTECTED TO ONLY ALLOW ADMINS/SUPERUSERS.
-    """
-    # This is a placeholder for admin functionality. 
-    # Ensure proper authorization (e.g., using get_current_active_superuser) before enabling.
-    # For now, it's commented out in main.py or should raise a 501 Not Implemented.
-    # raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Admin access only")
-    orders = crud_order.get_orders(db, skip=skip, limit=limit)
-    return orders
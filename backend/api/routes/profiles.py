@@ -0,0 +1,42 @@
+# backend/api/routes/profiles.py
+# Request profiles taken by core.profiling.ProfilingMiddleware. They show the code
+# paths and timings of other users' requests, so reading them takes an authenticated
+# user (admin, like /orders/all: needs superuser protection once roles exist).
+# Only mounted when PROFILING_ENABLED; sync in both modes, like analytics.
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import PlainTextResponse
+
+from api import deps
+from core import profiling
+from schemas import profile as profile_schemas
+from schemas import user as user_schemas
+
+router = APIRouter()
+
+@router.get("", response_model=List[profile_schemas.Profile])
+def read_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user), # TODO: get_current_active_superuser
+):
+    """
+    The most recent request profiles, newest first.
+    """
+    return profiling.profile_store.list(limit=limit)
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+def read_profile(
+    profile_id: str = Path(..., pattern=profiling.PROFILE_ID_PATTERN),
+    current_user: user_schemas.User = Depends(deps.get_current_active_user), # TODO: get_current_active_superuser
+):
+    """
+    The sampled stacks of one profile in the collapsed format ("frame;frame;... count"
+    per line), for flamegraph.pl, inferno or speedscope.
+    """
+    folded = profiling.profile_store.folded(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(
+        folded, headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
@@ -0,0 +1,101 @@
+# backend/benchmarks/_support.py
+# Shared helpers for the benchmark scripts.
+# Import this module before any app module: it points the app at a throw-away
+# SQLite database so a benchmark can never write into slicedsite.db.
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List
+
+_tmpdir = tempfile.mkdtemp(prefix="slicesite-bench-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+
+from sqlalchemy import event # noqa: E402
+
+from database import database, models # noqa: E402
+from schemas import menu as menu_schemas # noqa: E402
+
+def reset_database() -> None:
+    models.Base.metadata.drop_all(bind=database.engine)
+    models.Base.metadata.create_all(bind=database.engine)
+
+def seed_menu(count: int) -> List[str]:
+    # Synthetic catalog: a few categories, deterministic ids and prices
+    categories = ["Pizzas Tradicionais", "Pizzas Especiais", "Bebidas", "Sobremesas", "Porções"]
+    ids = []
+    db = database.SessionLocal()
+    try:
+        for i in range(count):
+            item = menu_schemas.MenuItemCreate(
+                id=f"item-{i:05d}",
+                name=f"Item {i}",
+                description=f"Descrição do item {i}",
+                price=10 + (i % 40) * 0.5,
+                category=categories[i % len(categories)],
+            )
+            db.add(models.MenuItem(**item.model_dump()))
+            ids.append(item.id)
+        db.commit()
+    finally:
+        db.close()
+    return ids
+
+def seed_user(email: str = "bench@example.com") -> int:
+    db = database.SessionLocal()
+    try:
+        # A pre-computed hash keeps bcrypt out of the setup time
+        user = models.User(email=email, hashed_password="!")
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+@contextmanager
+def count_queries(engine=None) -> Iterator[Dict[str, int]]:
+    engine = engine or database.engine
+    counter = {"queries": 0}
+    def _before_cursor_execute(*args):
+        counter["queries"] += 1
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def time_calls(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def seed_orders(user_id: int, menu_ids: List[str], count: int, lines_per_order: int = 3, days: int = 1) -> None:
+    # Orders are spread evenly over the last `days` days
+    now = models.utcnow()
+    db = database.SessionLocal()
+    try:
+        menu_items = {item.id: item for item in db.query(models.MenuItem).filter(models.MenuItem.id.in_(menu_ids))}
+        for i in range(count):
+            items = []
+            for j in range(lines_per_order):
+                menu_item = menu_items[menu_ids[(i + j) % len(menu_ids)]]
+                items.append(models.OrderItem(
+                    menu_item_id=menu_item.id, quantity=1 + j % 2, unit_price=menu_item.price, name=menu_item.name
+                ))
+            total_price = sum(item.unit_price * item.quantity for item in items)
+            created_at = now - timedelta(days=i * days // count)
+            db.add(models.Order(user_id=user_id, total_price=total_price, created_at=created_at, items=items))
+        db.commit()
+    finally:
+        db.close()
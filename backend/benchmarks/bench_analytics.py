@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_analytics.py
+# Dashboard query cost as the order history grows: the rollup-backed reports in
+# crud/crud_analytics.py against the same report computed live with a GROUP BY
+# over order_items. Also checks that the rollups maintained by create_order match
+# a full rebuild from order_items.
+#
+#   python -m benchmarks.bench_analytics --orders 10000 50000 100000 --days 90
+import argparse
+import sys
+
+from sqlalchemy import func, select
+
+from benchmarks import _support
+
+from crud import crud_analytics, crud_order
+from database import database, models
+from schemas import order as order_schemas
+
+def live_top_sellers(db, limit=10):
+    units = func.sum(models.OrderItem.quantity)
+    return db.execute(
+        select(models.OrderItem.menu_item_id, units, func.sum(models.OrderItem.quantity * models.MenuItem.price))
+        .join(models.MenuItem, models.MenuItem.id == models.OrderItem.menu_item_id)
+        .group_by(models.OrderItem.menu_item_id)
+        .order_by(units.desc(), models.OrderItem.menu_item_id)
+        .limit(limit)
+    ).all()
+
+def live_revenue_by_category(db):
+    revenue = func.sum(models.OrderItem.quantity * models.MenuItem.price)
+    return db.execute(
+        select(models.MenuItem.category, func.sum(models.OrderItem.quantity), revenue)
+        .join(models.MenuItem, models.MenuItem.id == models.OrderItem.menu_item_id)
+        .group_by(models.MenuItem.category)
+        .order_by(revenue.desc())
+    ).all()
+
+def rollup_rows(db):
+    return (
+        sorted(tuple(row) for row in db.execute(select(models.SalesDailyItem.__table__)).all()),
+        sorted(tuple(row) for row in db.execute(select(models.SalesDailyCategory.__table__)).all()),
+    )
+
+def check_incremental(db, menu_ids, user_id, orders=200):
+    # Orders placed through create_order must leave the rollups equal to a rebuild
+    for i in range(orders):
+        order = order_schemas.OrderCreate(items=[
+            order_schemas.OrderItemCreate(menu_item_id=menu_ids[(i * 7 + j) % len(menu_ids)], quantity=1 + (i + j) % 3)
+            for j in range(1 + i % 4)
+        ])
+        crud_order.create_order(db, order, user_id)
+    incremental = rollup_rows(db)
+    crud_analytics.rebuild_rollups(db)
+    db.commit()
+    return incremental == rollup_rows(db)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(60)
+    user_id = _support.seed_user()
+
+    db = database.SessionLocal()
+    try:
+        consistent = check_incremental(db, menu_ids, user_id)
+        print("incremental rollups match rebuild:", consistent)
+
+        print(f"{'orders':>7} {'report':>20} {'live ms':>8} {'rollup ms':>9}")
+        seeded = 0
+        for count in sorted(args.orders):
+            _support.seed_orders(user_id, menu_ids, count - seeded, days=args.days)
+            seeded = count
+            crud_analytics.rebuild_rollups(db)
+            db.commit()
+            for name, live, rollup in (
+                ("top sellers", live_top_sellers, crud_analytics.get_top_sellers),
+                ("revenue by category", live_revenue_by_category, crud_analytics.get_revenue_by_category),
+            ):
+                live_ms = _support.percentile(_support.time_calls(lambda: live(db), args.repeat), 50) * 1000
+                rollup_ms = _support.percentile(_support.time_calls(lambda: rollup(db), args.repeat), 50) * 1000
+                print(f"{count:>7} {name:>20} {live_ms:>8.2f} {rollup_ms:>9.2f}")
+    finally:
+        db.close()
+    if not consistent:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_async_mode.py
+# Throughput and tail latency of the sync routes (threadpool + Session) against the
+# async routes (AsyncSession) under concurrent clients. Each mode runs in its own
+# process because DATABASE_ASYNC_MODE is read when main.py is imported.
+#
+#   python -m benchmarks.bench_async_mode --concurrency 8 32 128 --requests 2000
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+PATHS = ("/api/v1/menu/", "/api/v1/menu/item-00007", "/api/v1/orders/me?limit=20")
+
+async def drive(app, token, concurrency, total):
+    import httpx
+    from benchmarks import _support
+
+    samples = []
+    errors = 0
+    remaining = iter(range(total))
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        async def worker():
+            nonlocal errors
+            for i in remaining:
+                start = time.perf_counter()
+                response = await client.get(PATHS[i % len(PATHS)])
+                samples.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50_ms": _support.percentile(samples, 50) * 1000,
+        "p99_ms": _support.percentile(samples, 99) * 1000,
+        "errors": errors,
+    }
+
+def child(concurrency_levels, total):
+    from benchmarks import _support
+
+    from core import security
+    from main import app
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(50)
+    user_id = _support.seed_user()
+    _support.seed_orders(user_id, menu_ids, 200)
+    token = security.create_access_token({"sub": "bench@example.com", "email": "bench@example.com"})
+    async def drive_all():
+        return [await drive(app, token, concurrency, total) for concurrency in concurrency_levels]
+    print(json.dumps(asyncio.run(drive_all())))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--child", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.concurrency, args.requests)
+        return
+
+    print(f"{'mode':>5} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for mode in ("sync", "async"):
+        env = dict(os.environ, DATABASE_ASYNC_MODE=str(mode == "async"))
+        command = [sys.executable, "-m", "benchmarks.bench_async_mode", "--child", mode,
+                   "--requests", str(args.requests), "--concurrency", *map(str, args.concurrency)]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        for result in json.loads(output.splitlines()[-1]):
+            print(
+                f"{mode:>5} {result['concurrency']:>7} {result['rps']:>8.0f} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>6}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_create_order.py
+# How order creation latency grows with the number of order lines.
+# Compares crud_order.create_order (one batched menu lookup) against the former
+# one-SELECT-per-line lookup, reimplemented below as a reference.
+#
+#   python -m benchmarks.bench_create_order --lines 1 5 10 20 50 --repeat 200
+import argparse
+
+from benchmarks import _support
+
+from crud import crud_menu, crud_order
+from database import database, models
+from schemas import order as order_schemas
+
+def create_order_per_line(db, order: order_schemas.OrderCreate, user_id: int) -> models.Order:
+    total_price = 0
+    db_order_items = []
+    for item_in in order.items:
+        menu_item = crud_menu.get_menu_item(db, item_in.menu_item_id)
+        if not menu_item:
+            raise ValueError(f"Menu item with id {item_in.menu_item_id} not found.")
+        total_price += menu_item.price * item_in.quantity
+        db_order_items.append(models.OrderItem(menu_item_id=item_in.menu_item_id, quantity=item_in.quantity))
+    db_order = models.Order(user_id=user_id, total_price=total_price, items=db_order_items)
+    db.add(db_order)
+    db.commit()
+    db.refresh(db_order)
+    return db_order
+
+def run(implementation, order, user_id, repeat):
+    db = database.SessionLocal()
+    try:
+        with _support.count_queries() as counter:
+            implementation(db, order, user_id)
+        samples = _support.time_calls(lambda: implementation(db, order, user_id), repeat)
+    finally:
+        db.close()
+    return counter["queries"], samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 5, 10, 20, 50])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(max(args.lines))
+    user_id = _support.seed_user()
+
+    print(f"{'lines':>5} {'impl':>9} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for lines in args.lines:
+        order = order_schemas.OrderCreate(
+            items=[order_schemas.OrderItemCreate(menu_item_id=menu_ids[i], quantity=1) for i in range(lines)]
+        )
+        for name, implementation in (("per-line", create_order_per_line), ("batched", crud_order.create_order)):
+            queries, samples = run(implementation, order, user_id, args.repeat)
+            print(
+                f"{lines:>5} {name:>9} {queries:>7} "
+                f"{_support.percentile(samples, 50) * 1000:>8.3f} {_support.percentile(samples, 95) * 1000:>8.3f}"
+            )
+
+if __name__ == "__main__":
+    main()
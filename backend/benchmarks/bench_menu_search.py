@@ -0,0 +1,69 @@
+# backend/benchmarks/bench_menu_search.py
+# Menu search: the in-memory inverted index used by GET /menu/?q= against the
+# ILIKE '%q%' table scan in crud_menu.search_menu_items.
+#
+#   python -m benchmarks.bench_menu_search --items 5000 --repeat 200
+import argparse
+import random
+import time
+
+from benchmarks import _support
+
+from crud import crud_menu
+from crud.menu_cache import menu_catalog
+from database import database, models
+
+WORDS = [
+    "mussarela", "calabresa", "manjericão", "tomate", "cebola", "azeitonas", "presunto", "ovo",
+    "pimentão", "frango", "catupiry", "bacon", "milho", "palmito", "rúcula", "parmesão",
+    "gorgonzola", "provolone", "atum", "chocolate", "morango", "banana", "canela", "água", "gás",
+]
+QUERIES = ["mussarela", "manjericao", "frango catupiry", "agua", "parm", "chocolate morango", "pizza"]
+
+def seed(count: int) -> None:
+    rng = random.Random(42)
+    db = database.SessionLocal()
+    try:
+        for i in range(count):
+            words = rng.sample(WORDS, 5)
+            db.add(models.MenuItem(
+                id=f"item-{i:05d}",
+                name=f"Pizza {words[0].capitalize()} {i}",
+                description=", ".join(words[1:]).capitalize() + ".",
+                price=20 + i % 30,
+                category=rng.choice(["Pizzas Tradicionais", "Pizzas Doces", "Bebidas"]),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    _support.reset_database()
+    seed(args.items)
+    db = database.SessionLocal()
+    try:
+        snapshot = menu_catalog.snapshot(db)
+        start = time.perf_counter()
+        snapshot.search_index # Built once per catalog version
+        print(f"index build for {args.items} items: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+        print(f"{'query':<20} {'ilike hits':>10} {'ilike p50 ms':>12} {'index hits':>10} {'index p50 ms':>12}")
+        for query in QUERIES:
+            ilike_hits = len(crud_menu.search_menu_items(db, query, limit=args.items))
+            ilike = _support.time_calls(lambda: crud_menu.search_menu_items(db, query, limit=100), args.repeat)
+            index_hits = len(snapshot.search_menu_items(query, limit=args.items))
+            index = _support.time_calls(lambda: snapshot.search_menu_items(query, limit=100), args.repeat)
+            print(
+                f"{query:<20} {ilike_hits:>10} {_support.percentile(ilike, 50) * 1000:>12.3f} "
+                f"{index_hits:>10} {_support.percentile(index, 50) * 1000:>12.3f}"
+            )
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
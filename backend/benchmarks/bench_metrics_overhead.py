@@ -0,0 +1,90 @@
+# backend/benchmarks/bench_metrics_overhead.py
+# Per-request cost of the always-on instrumentation: core.metrics.MetricsMiddleware
+# and core.query_stats.QueryStatsMiddleware, around a trivial FastAPI route called
+# straight through ASGI (no server, no network), so the difference between variants
+# is the middleware itself. Also times rendering /api/v1/metrics.
+#
+#   python -m benchmarks.bench_metrics_overhead --requests 20000
+import argparse
+import asyncio
+import time
+
+from benchmarks import _support
+
+from fastapi import FastAPI
+
+from core import metrics, query_stats
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    for cls in middleware:
+        app.add_middleware(cls)
+    return app
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+        "client": ("bench", 1), "server": ("bench", 80),
+    }
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        pass
+    await app(scope, receive, send)
+
+async def measure(app, requests: int) -> float:
+    for i in range(200): # Warm-up (route compilation, first-series allocations)
+        await call(app, f"/items/{i}")
+    started = time.perf_counter()
+    for i in range(requests):
+        await call(app, f"/items/{i}")
+    return (time.perf_counter() - started) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    variants = {
+        "bare": [],
+        "query stats": [query_stats.QueryStatsMiddleware],
+        "metrics": [metrics.MetricsMiddleware],
+        "metrics + query stats": [query_stats.QueryStatsMiddleware, metrics.MetricsMiddleware],
+    }
+    apps = {name: build_app(middleware) for name, middleware in variants.items()}
+    # Best of several interleaved rounds, to keep the comparison fair on a noisy machine
+    best = {name: float("inf") for name in variants}
+    for _ in range(args.rounds):
+        for name, app in apps.items():
+            best[name] = min(best[name], asyncio.run(measure(app, args.requests)))
+
+    print(f"{'variant':>22} {'us/request':>10} {'overhead us':>11}")
+    for name in variants:
+        print(f"{name:>22} {best[name] * 1e6:>10.1f} {(best[name] - best['bare']) * 1e6:>11.1f}")
+
+    # The recording itself, without the ASGI plumbing around it
+    scope = {"method": "GET", "path": "/items/7", "route": apps["metrics"].routes[-1], "path_params": {"item_id": 7}}
+    def record():
+        metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+        metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+        route = metrics.route_template(scope)
+        metrics.HTTP_REQUESTS.inc("GET", route, "200")
+        metrics.HTTP_REQUEST_DURATION.observe(0.003, "GET", route)
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        record()
+    print(f"recording only: {(time.perf_counter() - started) / args.requests * 1e6:.2f} us/request")
+
+    samples = _support.time_calls(metrics.registry.render, 200)
+    series = metrics.registry.render().count("\n")
+    print(f"render /metrics: {_support.percentile(samples, 50) * 1000:.2f} ms for {series} lines")
+
+if __name__ == "__main__":
+    main()
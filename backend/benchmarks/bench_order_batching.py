@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_order_batching.py
+# Order inserts per second from concurrent writers: one commit per order
+# (crud_order.create_order) against group commit (crud/order_batcher.py).
+# Every 20th order refers to an unknown menu item, to check that it fails alone.
+#
+#   python -m benchmarks.bench_order_batching --threads 4 16 64 --orders 2000
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import _support
+
+from crud import crud_order
+from crud.order_batcher import OrderBatcher
+from database import database
+from schemas import order as order_schemas
+
+def make_order(menu_ids, i):
+    if i % 20 == 19:
+        return order_schemas.OrderCreate(items=[order_schemas.OrderItemCreate(menu_item_id="missing", quantity=1)])
+    return order_schemas.OrderCreate(items=[
+        order_schemas.OrderItemCreate(menu_item_id=menu_ids[(i + j) % len(menu_ids)], quantity=1) for j in range(3)
+    ])
+
+def run(create, threads, orders):
+    def worker(i):
+        db = database.SessionLocal() # One session per order, as per request
+        try:
+            create(db, i)
+            return True
+        except ValueError:
+            return False
+        finally:
+            db.close()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, range(orders)))
+    return time.perf_counter() - started, results.count(True), results.count(False)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(100)
+    user_id = _support.seed_user()
+
+    batcher = OrderBatcher(database.SessionLocal, max_batch_size=args.batch_size, max_wait_seconds=args.wait_ms / 1000)
+    implementations = (
+        ("per-order", lambda db, i: crud_order.create_order(db, make_order(menu_ids, i), user_id)),
+        ("batched", lambda db, i: batcher.submit(make_order(menu_ids, i), user_id)),
+    )
+    print(f"{'threads':>7} {'impl':>9} {'orders/s':>9} {'ok':>6} {'rejected':>8}")
+    for threads in args.threads:
+        for name, create in implementations:
+            elapsed, ok, rejected = run(create, threads, args.orders)
+            print(f"{threads:>7} {name:>9} {ok / elapsed:>9.0f} {ok:>6} {rejected:>8}")
+    batcher.close()
+    print("batcher:", batcher.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_order_export.py
+# Peak Python memory of exporting every order: the streaming export
+# (crud/order_export.py) against loading the orders as one page and serializing it,
+# which is what paging through /orders/all amounts to. The export should stay flat
+# as the number of orders grows.
+#
+#   python -m benchmarks.bench_order_export --orders 5000 20000 50000
+import argparse
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks import _support
+
+from crud import crud_order, order_export
+from database import database
+from schemas import order as order_schemas
+
+_orders_adapter = TypeAdapter(List[order_schemas.Order])
+
+def export_streaming(export_format):
+    return sum(len(chunk) for chunk in order_export.stream_orders(export_format))
+
+def export_materialized(count):
+    db = database.SessionLocal()
+    try:
+        orders = crud_order.get_orders(db, limit=count)
+        return len(_orders_adapter.dump_json(_orders_adapter.validate_python(orders)))
+    finally:
+        db.close()
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[5000, 20000, 50000])
+    args = parser.parse_args()
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(50)
+    user_id = _support.seed_user()
+    seeded = 0
+
+    print(f"{'orders':>7} {'impl':>14} {'MB out':>7} {'seconds':>8} {'peak MB':>8}")
+    for count in sorted(args.orders):
+        _support.seed_orders(user_id, menu_ids, count - seeded)
+        seeded = count
+        for name, fn in (
+            ("stream ndjson", lambda: export_streaming("ndjson")),
+            ("stream csv", lambda: export_streaming("csv")),
+            ("one page", lambda: export_materialized(count)),
+        ):
+            size, elapsed, peak = measure(fn)
+            print(f"{count:>7} {name:>14} {size / 1e6:>7.1f} {elapsed:>8.2f} {peak / 1e6:>8.1f}")
+
+if __name__ == "__main__":
+    main()
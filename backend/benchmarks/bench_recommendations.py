@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_recommendations.py
+# The "frequently bought together" engine (crud/recommendations.py) on a synthetic
+# order history: full build time, incremental refresh time for a burst of new
+# orders, and recommend() latency for random carts. No database involved: the
+# history is generated with NumPy (popularity follows a Zipf-like curve).
+#
+#   python -m benchmarks.bench_recommendations --orders 1000000 5000000 --items 300
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks import _support
+
+from crud.recommendations import CoOccurrenceRecommender
+
+def synthetic_history(rng, orders, items, max_basket):
+    sizes = rng.integers(1, max_basket + 1, size=orders)
+    weights = 1.0 / np.arange(1, items + 1)
+    item_codes = rng.choice(items, size=int(sizes.sum()), p=weights / weights.sum())
+    order_ids = np.repeat(np.arange(1, orders + 1), sizes)
+    return order_ids, item_codes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[1000000, 5000000])
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--max-basket", type=int, default=5)
+    parser.add_argument("--burst", type=int, default=10000, help="New orders merged by one refresh")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    item_names = np.array([f"item-{i:05d}" for i in range(args.items)], dtype=object)
+    carts = [list(rng.choice(item_names, size=rng.integers(1, 5), replace=False)) for _ in range(args.repeat)]
+    allowed = set(item_names[::3]) # e.g. the drinks
+
+    print(f"{'orders':>8} {'build s':>8} {'refresh ms':>10} {'p50 us':>7} {'p99 us':>7} {'p99 us (filtered)':>17}")
+    for orders in args.orders:
+        order_ids, item_codes = synthetic_history(rng, orders, args.items, args.max_basket)
+        recommender = CoOccurrenceRecommender(refresh_seconds=0)
+        started = time.perf_counter()
+        recommender.load(order_ids, item_names[item_codes])
+        build_seconds = time.perf_counter() - started
+
+        burst_ids, burst_codes = synthetic_history(rng, args.burst, args.items, args.max_basket)
+        boundaries = np.flatnonzero(np.diff(burst_ids)) + 1
+        for offset, codes in enumerate(np.split(burst_codes, boundaries)):
+            recommender.record_order(orders + 1 + offset, item_names[codes])
+        started = time.perf_counter()
+        recommender.refresh(force=True)
+        refresh_ms = (time.perf_counter() - started) * 1000
+
+        cart_iter = iter(carts * 2)
+        samples = _support.time_calls(lambda: recommender.recommend(None, next(cart_iter), limit=5), args.repeat)
+        filtered = _support.time_calls(
+            lambda: recommender.recommend(None, next(cart_iter), limit=5, allowed=allowed), args.repeat
+        )
+        print(
+            f"{orders:>8} {build_seconds:>8.2f} {refresh_ms:>10.2f} "
+            f"{_support.percentile(samples, 50) * 1e6:>7.0f} {_support.percentile(samples, 99) * 1e6:>7.0f} "
+            f"{_support.percentile(filtered, 99) * 1e6:>17.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
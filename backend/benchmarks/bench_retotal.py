@@ -0,0 +1,72 @@
+# backend/benchmarks/bench_retotal.py
+# Reconciling every stored order total against its lines: crud_order.retotal_orders
+# (one GROUP BY over integer cents) against loading the orders with their items and
+# adding the lines up in Python. Both must report the same, deliberately broken, orders.
+#
+#   python -m benchmarks.bench_retotal --orders 10000 50000 100000
+import argparse
+import sys
+import time
+
+from sqlalchemy import update
+
+from benchmarks import _support
+
+from core import money
+from crud import crud_order
+from database import database, models
+
+def python_retotal(db):
+    mismatches = []
+    for order in crud_order.get_orders(db, limit=None):
+        computed = sum(item.unit_price * item.quantity for item in order.items)
+        if computed != order.total_price:
+            mismatches.append(order.id)
+    return sorted(mismatches)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--broken", type=int, default=100, help="orders whose total is off by one cent")
+    args = parser.parse_args()
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(60)
+    user_id = _support.seed_user()
+    agree = True
+
+    print(f"{'orders':>7} {'mismatches':>10} {'sql ms':>8} {'python ms':>9}")
+    seeded = 0
+    db = database.SessionLocal()
+    try:
+        for count in sorted(args.orders):
+            _support.seed_orders(user_id, menu_ids, count - seeded)
+            seeded = count
+            step = max(1, count // args.broken)
+            db.execute(
+                update(models.Order)
+                .where(models.Order.id % step == 0)
+                .values(total_price=models.Order.total_price + money.CENT)
+            )
+            db.commit()
+
+            started = time.perf_counter()
+            found = crud_order.retotal_orders(db)
+            sql_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            expected = python_retotal(db)
+            python_ms = (time.perf_counter() - started) * 1000
+            db.expunge_all()
+            agree = agree and [mismatch.order_id for mismatch in found] == expected
+
+            crud_order.retotal_orders(db, fix=True)
+            db.commit()
+            print(f"{count:>7} {len(found):>10} {sql_ms:>8.1f} {python_ms:>9.1f}")
+    finally:
+        db.close()
+    print("sql and python agree:", agree)
+    if not agree:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
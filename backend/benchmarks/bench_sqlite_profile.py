@@ -0,0 +1,105 @@
+# backend/benchmarks/bench_sqlite_profile.py
+# Concurrent read/write throughput of SQLite with its stock settings (rollback
+# journal, synchronous=FULL) against the tuned profile from core/config.py (WAL,
+# synchronous=NORMAL, mmap, larger page cache). Reader and writer threads share the
+# app's engine and pool. Each profile runs in its own process because the pragmas
+# are read from the environment when the engine is created.
+#
+#   python -m benchmarks.bench_sqlite_profile --readers 8 --writers 4 --seconds 5
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+PROFILES = {
+    "stock": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_CACHE_SIZE": "0",
+    },
+    "tuned": {}, # The defaults in core/config.py
+}
+
+def child(readers, writers, seconds):
+    from benchmarks import _support
+
+    from sqlalchemy.exc import OperationalError
+
+    from crud import crud_menu, crud_order
+    from database import database
+    from schemas import order as order_schemas
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(200)
+    user_id = _support.seed_user()
+    _support.seed_orders(user_id, menu_ids, 2000)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def loop(operation, counter):
+        db = database.SessionLocal()
+        done = errors = 0
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    operation(db, done)
+                    done += 1
+                except OperationalError: # "database is locked" once busy_timeout runs out
+                    db.rollback()
+                    errors += 1
+        finally:
+            db.close()
+        with lock:
+            counts[counter] += done
+            counts["errors"] += errors
+
+    def read(db, i):
+        if i % 2:
+            crud_menu.get_menu_items(db, skip=i % 100, limit=50)
+        else:
+            crud_order.get_orders_by_user(db, user_id=user_id, limit=20)
+        db.rollback() # End the read transaction, as a request would
+
+    def write(db, i):
+        order = order_schemas.OrderCreate(items=[
+            order_schemas.OrderItemCreate(menu_item_id=menu_ids[(i + j) % len(menu_ids)], quantity=1) for j in range(3)
+        ])
+        crud_order.create_order(db, order=order, user_id=user_id)
+
+    threads = [threading.Thread(target=loop, args=(read, "reads")) for _ in range(readers)]
+    threads += [threading.Thread(target=loop, args=(write, "writes")) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({key: value / seconds if key != "errors" else value for key, value in counts.items()}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--child", choices=sorted(PROFILES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.readers, args.writers, args.seconds)
+        return
+
+    print(f"{'profile':>7} {'reads/s':>8} {'writes/s':>8} {'errors':>6}")
+    for profile, overrides in PROFILES.items():
+        env = dict(os.environ, **overrides)
+        command = [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--child", profile,
+                   "--readers", str(args.readers), "--writers", str(args.writers), "--seconds", str(args.seconds)]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f"{profile:>7} {result['reads']:>8.0f} {result['writes']:>8.0f} {result['errors']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# backend/benchmarks/check_auth_cache.py
+# Regression check for the authenticated user cache (crud/user_cache.py): a token's
+# user is queried once and then served from the cache, a password change drops the
+# cached snapshot, the next request caches the changed user again, and a snapshot
+# read before an invalidation is never cached. Query counts are read from the
+# Server-Timing header (core/query_stats.py).
+# Exits with status 1 when a step does not behave as expected.
+#
+#   python -m benchmarks.check_auth_cache
+import re
+import sys
+
+from benchmarks import _support
+
+from fastapi.testclient import TestClient
+
+import main
+from core import query_stats, security
+from crud.user_cache import auth_user_cache
+from database import database, models
+from schemas import user as user_schemas
+
+PASSWORD = "check-password"
+NEW_PASSWORD = "check-password-2"
+_QUERY_COUNT = re.compile(r'(?:^|,\s*)db;[^,]*desc="(\d+) quer(?:y|ies)"')
+
+def _queries(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(_QUERY_COUNT.search(response.headers[query_stats.SERVER_TIMING_HEADER]).group(1))
+
+def main_check() -> int:
+    _support.reset_database()
+    db = database.SessionLocal()
+    try:
+        user = models.User(email="cache@example.com", hashed_password=security.get_password_hash(PASSWORD))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+
+    client = TestClient(main.app)
+    token = client.post("/api/v1/auth/token", data={"username": "cache@example.com", "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {token.json()['access_token']}"}
+    me = lambda: _queries(client.get("/api/v1/auth/users/me", headers=headers))
+
+    # (step, queries expected for GET /users/me)
+    steps = [("first request", me(), 1), ("cached", me(), 0)]
+    response = client.put(
+        "/api/v1/auth/users/me/password", headers=headers,
+        json={"old_password": PASSWORD, "new_password": NEW_PASSWORD},
+    )
+    assert response.status_code == 200, response.text
+    steps += [("after password change", me(), 1), ("cached again", me(), 0)]
+
+    failures = 0
+    for step, queries, expected in steps:
+        ok = queries == expected
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {step:<22} user queries {queries} (expected {expected})")
+
+    # A snapshot loaded before an invalidation, put() after it
+    snapshot = user_schemas.User(id=user_id, email="cache@example.com", is_active=True)
+    generation = auth_user_cache.generation()
+    auth_user_cache.invalidate_user(user_id)
+    auth_user_cache.put("stale-token", snapshot, generation)
+    ok = auth_user_cache.get("stale-token") is None
+    failures += not ok
+    print(f"{'ok' if ok else 'FAIL':>4}  {'stale snapshot':<22} {'not cached' if ok else 'cached'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_check())
@@ -0,0 +1,59 @@
+# backend/benchmarks/check_query_counts.py
+# Regression check: the order read endpoints must run a fixed number of SQL
+# statements whatever the page size (no lazy-load N+1 on Order.items). The counts
+# are read from each response's Server-Timing header (core/query_stats.py).
+# Exits with status 1 when a count differs from EXPECTED_QUERIES.
+#
+#   python -m benchmarks.check_query_counts
+import re
+import sys
+
+from benchmarks import _support
+
+from fastapi.testclient import TestClient
+
+import main
+from api import deps
+from core import query_stats
+from core.config import settings
+from database import database, models
+
+PAGE_SIZES = [1, 10, 100]
+_QUERY_COUNT = re.compile(r'(?:^|,\s*)db;[^,]*desc="(\d+) quer(?:y|ies)"')
+# Statements per request: the orders query, plus one IN query for the items with "selectin"
+EXPECTED_QUERIES = {"selectin": 2, "joined": 1}
+
+def main_check() -> int:
+    _support.reset_database()
+    menu_ids = _support.seed_menu(20)
+    user_id = _support.seed_user()
+    _support.seed_orders(user_id, menu_ids, count=max(PAGE_SIZES) + 5)
+
+    db = database.SessionLocal()
+    user = db.get(models.User, user_id)
+    db.close()
+    # Authentication is not what is being measured here
+    main.app.dependency_overrides[deps.get_current_active_user] = lambda: user
+    client = TestClient(main.app)
+
+    failures = 0
+    for strategy in ("selectin", "joined"):
+        settings.ORDER_ITEMS_LOAD_STRATEGY = strategy
+        endpoints = {
+            "GET /orders/me": lambda size: client.get("/api/v1/orders/me", params={"limit": size}),
+            "GET /orders/all": lambda size: client.get("/api/v1/orders/all", params={"limit": size}),
+            "GET /orders/{id}": lambda size: client.get(f"/api/v1/orders/{size}"),
+        }
+        for name, call in endpoints.items():
+            counts = []
+            for size in PAGE_SIZES:
+                response = call(size)
+                assert response.status_code == 200, response.text
+                counts.append(int(_QUERY_COUNT.search(response.headers[query_stats.SERVER_TIMING_HEADER]).group(1)))
+            ok = set(counts) == {EXPECTED_QUERIES[strategy]}
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':>4}  {strategy:<8} {name:<16} queries per page size {dict(zip(PAGE_SIZES, counts))}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_check())
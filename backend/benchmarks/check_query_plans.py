@@ -0,0 +1,179 @@
+# backend/benchmarks/check_query_plans.py
+# Regression check: runs each crud query against a seeded SQLite database, captures
+# the SQL it sends and asks SQLite for its plan (EXPLAIN QUERY PLAN). A plan that
+# scans a whole table or sorts through a temporary B-tree fails the check, unless
+# the query is listed in ALLOWED with the reason it has to.
+# Exits with status 1 on a failure.
+#
+#   python -m benchmarks.check_query_plans [--verbose]
+import argparse
+import re
+import sys
+from datetime import date
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+from benchmarks import _support
+
+from sqlalchemy import event
+
+from core.config import settings
+from crud import crud_analytics, crud_menu, crud_order, crud_user, order_export
+from crud.menu_cache import menu_catalog
+from crud.recommendations import CoOccurrenceRecommender
+from database import database
+from schemas import order as order_schemas
+
+FULL_SCAN = "full scan"
+TEMP_SORT = "temp b-tree"
+
+# A table read from start to end; "SCAN t USING [COVERING] INDEX i" walks an index in
+# order instead, which only reads what the query's LIMIT needs
+_FULL_SCAN_LINE = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+# Subqueries evaluated on their own: scanning their (already filtered) rows is not a table scan
+_SUBQUERY_LINE = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (?:SUBQUERY \d+ )?(\w+)")
+
+# Findings some queries cannot avoid, and why
+ALLOWED: Dict[str, Tuple[FrozenSet[str], str]] = {
+    "crud_order.get_orders": (
+        frozenset({FULL_SCAN}), "walks orders in rowid (id) order and stops at LIMIT",
+    ),
+    # joinedload wraps the LIMITed orders in a subquery and sorts the joined page again
+    "crud_order.get_orders [joined]": (
+        frozenset({FULL_SCAN, TEMP_SORT}), "walks orders in id order to LIMIT, re-sorts the page joined with its items",
+    ),
+    "crud_order.get_orders (before_id) [joined]": (frozenset({TEMP_SORT}), "re-sorts the page joined with its items"),
+    "crud_order.get_orders_by_user [joined]": (frozenset({TEMP_SORT}), "re-sorts the page joined with its items"),
+    "crud_order.get_orders_by_user (before_id) [joined]": (
+        frozenset({TEMP_SORT}), "re-sorts the page joined with its items",
+    ),
+    "crud_order.backfill_order_item_snapshots": (frozenset({FULL_SCAN}), "one-off batch job over every line"),
+    "crud_order.backfill_order_item_categories": (frozenset({FULL_SCAN}), "one-off batch job over every line"),
+    "crud_order.retotal_orders": (frozenset({FULL_SCAN, TEMP_SORT}), "batch check over every order"),
+    "crud_analytics.rebuild_rollups": (frozenset({FULL_SCAN, TEMP_SORT}), "batch rebuild over every line"),
+    "crud_analytics.get_top_sellers": (
+        frozenset({FULL_SCAN, TEMP_SORT}), "sorts by an aggregate of the (small) rollup table",
+    ),
+    "crud_analytics.get_revenue_by_category": (
+        frozenset({FULL_SCAN, TEMP_SORT}), "sorts by an aggregate of the (small) rollup table",
+    ),
+    "recommendations.build": (frozenset({FULL_SCAN}), "reads every order line by design"),
+}
+
+def capture_statements(fn: Callable[[], object]) -> List[Tuple[str, tuple]]:
+    statements: List[Tuple[str, tuple]] = []
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+            # An executemany gets a list of parameter sets: the first one is enough for the plan
+            statements.append((statement, parameters[0] if isinstance(parameters, list) else parameters))
+    event.listen(database.engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(database.engine, "before_cursor_execute", _before_cursor_execute)
+    return statements
+
+def explain(statement: str, parameters: tuple) -> List[str]:
+    # Straight to the DBAPI cursor: the parameters are already in the driver's format
+    with database.engine.connect() as connection:
+        cursor = connection.connection.cursor()
+        try:
+            rows = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        finally:
+            cursor.close()
+    return [row[-1] for row in rows] # (id, parent, notused, detail)
+
+def findings(plan: List[str]) -> FrozenSet[str]:
+    found = set()
+    subqueries = {match.group(1) for match in map(_SUBQUERY_LINE.match, plan) if match}
+    for line in plan:
+        scan = _FULL_SCAN_LINE.match(line)
+        if scan and scan.group(1) not in subqueries:
+            found.add(FULL_SCAN)
+        if line.startswith("USE TEMP B-TREE"):
+            found.add(TEMP_SORT)
+    return frozenset(found)
+
+def checks(db, user_id: int, menu_ids: List[str], order_id: int) -> Dict[str, Callable[[], object]]:
+    order = order_schemas.OrderCreate(items=[
+        order_schemas.OrderItemCreate(menu_item_id=menu_ids[0], quantity=2),
+        order_schemas.OrderItemCreate(menu_item_id=menu_ids[1], quantity=1),
+    ])
+    return {
+        "crud_user.get_user": lambda: crud_user.get_user(db, user_id),
+        "crud_user.get_user_by_email": lambda: crud_user.get_user_by_email(db, "bench@example.com"),
+        "crud_menu.get_menu_item": lambda: crud_menu.get_menu_item(db, menu_ids[3]),
+        "crud_menu.get_menu_items_by_ids": lambda: crud_menu.get_menu_items_by_ids(db, menu_ids[:5]),
+        "crud_menu.get_menu_items": lambda: crud_menu.get_menu_items(db, limit=20),
+        "crud_menu.get_menu_items (after_id)": lambda: crud_menu.get_menu_items(db, limit=20, after_id=menu_ids[10]),
+        "crud_menu.get_menu_items_by_category": lambda: crud_menu.get_menu_items_by_category(db, "Bebidas", limit=20),
+        "crud_menu.get_menu_items_by_category (after_id)": (
+            lambda: crud_menu.get_menu_items_by_category(db, "Bebidas", limit=20, after_id=menu_ids[10])
+        ),
+        "crud_menu.search_menu_items": lambda: crud_menu.search_menu_items(db, "item 1", limit=20),
+        "crud_order.create_order": lambda: crud_order.create_order(db, order, user_id),
+        "crud_order.get_order": lambda: crud_order.get_order(db, order_id),
+        "crud_order.get_orders": lambda: crud_order.get_orders(db, limit=20),
+        "crud_order.get_orders (before_id)": lambda: crud_order.get_orders(db, limit=20, before_id=order_id),
+        "crud_order.get_orders_by_user": lambda: crud_order.get_orders_by_user(db, user_id, limit=20),
+        "crud_order.get_orders_by_user (before_id)": (
+            lambda: crud_order.get_orders_by_user(db, user_id, limit=20, before_id=order_id)
+        ),
+        "crud_order.backfill_order_item_snapshots": lambda: crud_order.backfill_order_item_snapshots(db),
+        "crud_order.backfill_order_item_categories": lambda: crud_order.backfill_order_item_categories(db),
+        "crud_order.retotal_orders": lambda: crud_order.retotal_orders(db),
+        "order_export.stream_orders": lambda: b"".join(order_export.stream_orders("ndjson", min_id=1, max_id=50)),
+        "crud_analytics.rebuild_rollups": lambda: crud_analytics.rebuild_rollups(db),
+        "crud_analytics.get_top_sellers": lambda: crud_analytics.get_top_sellers(db, start=date(2000, 1, 1)),
+        "crud_analytics.get_revenue_by_category": lambda: crud_analytics.get_revenue_by_category(db),
+        "crud_analytics.get_daily_revenue": lambda: crud_analytics.get_daily_revenue(db, category="Bebidas"),
+        "menu_cache.load": lambda: (menu_catalog.invalidate(), menu_catalog.snapshot(db)),
+        "recommendations.build": lambda: CoOccurrenceRecommender().build(db),
+    }
+
+def main_check() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    _support.reset_database()
+    menu_ids = _support.seed_menu(200)
+    user_id = _support.seed_user()
+    other_user_id = _support.seed_user("other@example.com")
+    _support.seed_orders(user_id, menu_ids, 1000)
+    _support.seed_orders(other_user_id, menu_ids, 1000)
+
+    failures = 0
+    db = database.SessionLocal()
+    try:
+        for strategy in ("selectin", "joined"): # ORDER_ITEMS_LOAD_STRATEGY
+            settings.ORDER_ITEMS_LOAD_STRATEGY = strategy
+            for name, call in checks(db, user_id, menu_ids, order_id=500).items():
+                if strategy == "joined":
+                    if not name.startswith("crud_order.get_order"):
+                        continue # Only order reads depend on the loader strategy
+                    name += " [joined]"
+                statements = capture_statements(call)
+                db.rollback() # Batch jobs do not commit: drop their writes (and locks)
+                found = set()
+                plans = []
+                for statement, parameters in statements:
+                    plan = explain(statement, parameters)
+                    plans.append((statement, plan))
+                    found |= findings(plan)
+                allowed, reason = ALLOWED.get(name, (frozenset(), ""))
+                unexpected = found - allowed
+                failures += bool(unexpected)
+                status = "FAIL" if unexpected else "ok"
+                note = f"  ({', '.join(sorted(found))}: {reason})" if found and not unexpected else ""
+                print(f"{status:>4}  {name:<50} {', '.join(sorted(unexpected))}{note}")
+                if args.verbose or unexpected:
+                    for statement, plan in plans:
+                        print("        " + " ".join(statement.split())[:160])
+                        for line in plan:
+                            print("          " + line)
+    finally:
+        db.close()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_check())
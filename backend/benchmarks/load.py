@@ -0,0 +1,264 @@
+# backend/benchmarks/load.py
+# Load test of the whole API, in process: the FastAPI app is called through httpx's
+# ASGI transport (no server, no network) against a throw-away SQLite database seeded
+# with a menu, users and order history. Virtual clients each log in, then pick
+# requests from a weighted traffic mix (SCENARIOS) until --requests have been sent.
+# Reports throughput and p50/p95/p99 per scenario; --output saves them as JSON and
+# --baseline compares against a saved run (exit status 1 if a scenario regressed by
+# more than --max-regression percent in p95 or throughput).
+#
+# The mix is drawn from --seed, so runs with the same arguments send the same
+# requests. Sync or async routes follow DATABASE_ASYNC_MODE, as for the server.
+#
+#   python -m benchmarks.load --concurrency 32 --requests 5000 --output load.json
+#   python -m benchmarks.load --concurrency 32 --requests 5000 --baseline load.json
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from benchmarks import _support
+
+import httpx
+
+from core import security
+from core.config import settings
+from crud.order_batcher import order_batcher
+from database import database, models
+from main import app
+
+PASSWORD = "bench-password"
+CATEGORIES = ["Pizzas Tradicionais", "Pizzas Especiais", "Bebidas", "Sobremesas", "Porções"] # As _support.seed_menu
+SEARCH_TERMS = ["item 1", "item 2", "descrição", "item 99", "nada"]
+
+class Client:
+    """One virtual user: an HTTP client logged in as its own account."""
+
+    def __init__(self, http: httpx.AsyncClient, email: str, menu_ids: List[str], rng: random.Random):
+        self.http = http
+        self.email = email
+        self.menu_ids = menu_ids
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+
+    async def login(self) -> httpx.Response:
+        response = await self.http.post("/api/v1/auth/token", data={"username": self.email, "password": PASSWORD})
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def list_menu(self) -> httpx.Response:
+        return await self.http.get("/api/v1/menu/", params={"limit": 50})
+
+    async def browse_category(self) -> httpx.Response:
+        return await self.http.get("/api/v1/menu/", params={"category": self.rng.choice(CATEGORIES), "limit": 50})
+
+    async def read_menu_item(self) -> httpx.Response:
+        return await self.http.get(f"/api/v1/menu/{self.rng.choice(self.menu_ids)}")
+
+    async def search_menu(self) -> httpx.Response:
+        return await self.http.get("/api/v1/menu/", params={"q": self.rng.choice(SEARCH_TERMS), "limit": 20})
+
+    async def suggest(self) -> httpx.Response:
+        term = self.rng.choice(SEARCH_TERMS)
+        return await self.http.get("/api/v1/menu/suggest", params={"prefix": term[:self.rng.randint(1, len(term))]})
+
+    async def create_order(self) -> httpx.Response:
+        items = [
+            {"menu_item_id": menu_item_id, "quantity": self.rng.randint(1, 3)}
+            for menu_item_id in self.rng.sample(self.menu_ids, self.rng.randint(1, 4))
+        ]
+        return await self.http.post("/api/v1/orders/", json={"items": items}, headers=self.headers)
+
+    async def order_history(self) -> httpx.Response:
+        return await self.http.get("/api/v1/orders/me", params={"limit": 20}, headers=self.headers)
+
+# Scenario -> (Client method, weight)
+SCENARIOS = {
+    "menu list": (Client.list_menu, 23),
+    "menu category": (Client.browse_category, 15),
+    "menu item": (Client.read_menu_item, 15),
+    "menu search": (Client.search_menu, 10),
+    "menu suggest": (Client.suggest, 5),
+    "login": (Client.login, 2), # bcrypt: a few hundred ms of CPU per call
+    "order create": (Client.create_order, 15),
+    "order history": (Client.order_history, 15),
+}
+
+def seed(users: int, menu_items: int, orders_per_user: int) -> tuple:
+    _support.reset_database()
+    menu_ids = _support.seed_menu(menu_items)
+    hashed_password = security.get_password_hash(PASSWORD) # Once: every account shares it
+    emails = [f"load-{i}@example.com" for i in range(users)]
+    db = database.SessionLocal()
+    try:
+        accounts = [models.User(email=email, hashed_password=hashed_password) for email in emails]
+        db.add_all(accounts)
+        db.commit()
+        user_ids = [account.id for account in accounts]
+    finally:
+        db.close()
+    for user_id in user_ids:
+        _support.seed_orders(user_id, menu_ids, orders_per_user, days=30)
+    return emails, menu_ids
+
+async def run(emails: List[str], menu_ids: List[str], args) -> Dict:
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[name][1] for name in names]
+    samples: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def timed(name: str, call) -> None:
+        started = time.perf_counter()
+        try:
+            status = str((await call()).status_code)
+        except Exception as exc: # The app raised instead of answering
+            status = type(exc).__name__
+        samples[name].append(time.perf_counter() - started)
+        statuses[name][status] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as http:
+        clients = [
+            Client(http, emails[i % len(emails)], menu_ids, random.Random(f"{args.seed}-{i}"))
+            for i in range(args.concurrency)
+        ]
+        for client in clients: # Not timed: every client needs a token before the run
+            await client.login()
+
+        async def drive(client: Client, remaining) -> None:
+            for _ in remaining:
+                name = client.rng.choices(names, weights)[0]
+                await timed(name, lambda: SCENARIOS[name][0](client))
+
+        # Warm-up (caches, prepared pools), then the measured run; both share one iterator
+        # per phase so the total is exact whatever the clients' speed
+        warmup = iter(range(args.warmup))
+        await asyncio.gather(*(drive(client, warmup) for client in clients))
+        samples.clear()
+        statuses.clear()
+        remaining = iter(range(args.requests))
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(client, remaining) for client in clients))
+        elapsed = time.perf_counter() - started
+
+    scenarios = {}
+    for name in names:
+        if not samples[name]:
+            continue
+        ok = sum(count for status, count in statuses[name].items() if status.startswith(("2", "3")))
+        scenarios[name] = {
+            "requests": len(samples[name]),
+            "errors": len(samples[name]) - ok,
+            "rps": len(samples[name]) / elapsed,
+            "p50_ms": _support.percentile(samples[name], 50) * 1000,
+            "p95_ms": _support.percentile(samples[name], 95) * 1000,
+            "p99_ms": _support.percentile(samples[name], 99) * 1000,
+            "max_ms": max(samples[name]) * 1000,
+            "statuses": dict(sorted(statuses[name].items())),
+        }
+    every = [sample for values in samples.values() for sample in values]
+    return {
+        "seconds": elapsed,
+        "total": {
+            "requests": len(every),
+            "errors": sum(result["errors"] for result in scenarios.values()),
+            "rps": len(every) / elapsed,
+            "p50_ms": _support.percentile(every, 50) * 1000,
+            "p95_ms": _support.percentile(every, 95) * 1000,
+            "p99_ms": _support.percentile(every, 99) * 1000,
+        },
+        "scenarios": scenarios,
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: Dict) -> None:
+    print(f"{'scenario':>14} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(results["scenarios"].items()) + [("total", results["total"])]
+    for name, result in rows:
+        print(
+            f"{name:>14} {result['requests']:>8} {result['errors']:>6} {result['rps']:>8.0f} "
+            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+        )
+
+def compare(results: Dict, baseline: Dict, max_regression: float) -> int:
+    """Prints the change against `baseline`; returns the number of regressed scenarios."""
+    if baseline["config"] != results["config"]:
+        print(f"note: the baseline ran with {baseline['config']}")
+    print(f"\nvs baseline ({baseline['environment'].get('git_commit') or 'unknown commit'}):")
+    print(f"{'scenario':>14} {'req/s':>8} {'p95 ms':>8}")
+    regressions = 0
+    rows = list(results["scenarios"].items()) + [("total", results["total"])]
+    for name, result in rows:
+        before = baseline["total"] if name == "total" else baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:>14} {'new':>8}")
+            continue
+        rps_change = (result["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0.0
+        p95_change = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+        regressed = rps_change < -max_regression or p95_change > max_regression
+        regressions += regressed
+        print(f"{name:>14} {rps_change:>+7.1f}% {p95_change:>+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual clients")
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests (all clients)")
+    parser.add_argument("--warmup", type=int, default=200, help="requests sent before measuring")
+    parser.add_argument("--users", type=int, default=16, help="accounts the clients log in as")
+    parser.add_argument("--menu-items", type=int, default=200)
+    parser.add_argument("--orders-per-user", type=int, default=20, help="order history seeded per account")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results saved in this JSON file")
+    parser.add_argument("--max-regression", type=float, default=20, help="percent (p95 up or throughput down)")
+    args = parser.parse_args()
+
+    emails, menu_ids = seed(args.users, args.menu_items, args.orders_per_user)
+    try:
+        results = asyncio.run(run(emails, menu_ids, args))
+    finally:
+        order_batcher.close() # Commit what ORDER_BATCH_ENABLED may have queued
+    results = {
+        "config": {
+            name: getattr(args, name)
+            for name in ("concurrency", "requests", "warmup", "users", "menu_items", "orders_per_user", "seed")
+        },
+        "environment": {
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database_async_mode": settings.DATABASE_ASYNC_MODE,
+            "order_batch_enabled": settings.ORDER_BATCH_ENABLED,
+        },
+        **results,
+    }
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as saved:
+            baseline = json.load(saved)
+        if compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
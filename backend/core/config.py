@@ -1,6 +1,6 @@
 # backend/core/config.py
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Literal, Optional, Union
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "SliceSite API"
@@ -12,9 +12,92 @@ class Settings(BaseSettings):
 
     SQLALCHEMY_DATABASE_URL: str
 
+    # Async mode: routes use AsyncSession (api/routes/aio, crud/aio) instead of the
+    # threadpool-bound sync Session. The async URL defaults to SQLALCHEMY_DATABASE_URL
+    # with an async driver (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg).
+    DATABASE_ASYNC_MODE: bool = False
+    SQLALCHEMY_ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Connection pool, per engine (and so per worker process). Checkouts beyond
+    # POOL_SIZE + MAX_OVERFLOW wait up to POOL_TIMEOUT seconds. Connections older than
+    # POOL_RECYCLE seconds are replaced (-1 = never); PRE_PING tests each checkout.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite pragmas applied to every new connection (see database/database.py).
+    # WAL lets readers run alongside the writer, and synchronous=NORMAL skips the
+    # per-commit fsync that WAL makes safe to skip. An empty value or 0 keeps SQLite's default.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456 # Bytes
+    SQLITE_CACHE_SIZE: int = -65536 # Negative = KiB, i.e. 64 MiB per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
     # CORS Origins: can be a string of comma-separated origins or a list
     BACKEND_CORS_ORIGINS: Union[str, List[str]] = "*" # Default to all for development
 
+    # In-process menu catalog cache (see crud/menu_cache.py).
+    # The TTL bounds staleness when several worker processes share one database;
+    # writes made through this process invalidate the cache immediately. 0 = no expiry.
+    MENU_CACHE_TTL_SECONDS: int = 300
+
+    # How order reads load Order.items: "selectin" issues one extra IN query per page,
+    # "joined" uses a single LEFT OUTER JOIN (better for small pages on high-latency databases)
+    ORDER_ITEMS_LOAD_STRATEGY: Literal["selectin", "joined"] = "selectin"
+
+    # Group commit for POST /orders (see crud/order_batcher.py): orders arriving within
+    # MAX_WAIT_MS of each other are committed together, up to MAX_SIZE per transaction
+    ORDER_BATCH_ENABLED: bool = False
+    ORDER_BATCH_MAX_SIZE: int = 64
+    ORDER_BATCH_MAX_WAIT_MS: float = 5
+
+    # Orders placed since the last refresh are merged into the "frequently bought
+    # together" matrix (crud/recommendations.py) at most this often
+    RECOMMENDATIONS_REFRESH_SECONDS: float = 5
+    # Full rebuild from the database, for orders the incremental refresh can miss
+    # (committed out of id order by other worker processes). 0 = never
+    RECOMMENDATIONS_REBUILD_SECONDS: float = 3600
+
+    # Idempotency-Key store for POST /orders (see core/idempotency.py), per process
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_MAX_KEYS: int = 100000
+
+    # bcrypt runs on a dedicated thread pool (see core/security.py). At most
+    # WORKERS + QUEUE_SIZE hash/verify calls are admitted at once; beyond that the
+    # request gets 503 with Retry-After instead of tying up the request threadpool.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Per-request SQL statistics (see core/query_stats.py): query count and DB time in a
+    # Server-Timing header, and a warning (likely N+1) when one statement runs this many
+    # times in a request (0 disables the warning)
+    SQL_QUERY_STATS_ENABLED: bool = True
+    SQL_REPEATED_STATEMENT_WARNING: int = 10
+
+    # Request count, latency histograms per route and pool/cache statistics, served at
+    # /api/v1/metrics in the Prometheus text format (see core/metrics.py)
+    METRICS_ENABLED: bool = True
+
+    # Opt-in stack-sampling profiles of live requests (see core/profiling.py), listed
+    # to authenticated users at /api/v1/admin/profiles. A request is profiled when it
+    # carries PROFILING_HEADER (whose value must be PROFILING_TOKEN, if set) or is picked
+    # at PROFILING_SAMPLE_RATE (0-1); the newest PROFILING_MAX_PROFILES are kept in PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_PROFILES: int = 50
+
+    # Access token -> user snapshot cache used by deps.get_current_user (0 disables it)
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+
     # For pydantic-settings to load from .env file
     class Config:
         env_file = ".env"
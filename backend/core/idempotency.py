@@ -0,0 +1,129 @@
+# backend/core/idempotency.py
+# Idempotency keys for POST /orders.
+# A client that retries a request with the same Idempotency-Key header gets the
+# order created by the first attempt instead of a duplicate. The store maps
+# (user id, key) to the created order id and lives in this process: it is bounded
+# (LRU) and each key expires after IDEMPOTENCY_KEY_TTL_SECONDS. Keys whose first
+# request is still running are never evicted (a retry would create a duplicate);
+# when every key is in flight, new keyed requests are rejected instead.
+# A request arriving while the first one with its key is still running waits for
+# it instead of creating a second order.
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Tuple
+
+from core.config import settings
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# Set on responses that replay an earlier request instead of executing this one
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+STORE_FULL_RETRY_AFTER_SECONDS = 1
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a different payload; the routes answer 422."""
+
+class IdempotencyStoreFull(Exception):
+    """Every stored key is still in flight, so none can be evicted; the routes answer 503."""
+
+def fingerprint(payload: str) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    future: Future = field(default_factory=Future) # Resolves to the result id
+    expires_at: float = float("inf") # Set once the result is known
+
+class IdempotencyStore:
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, str], _Entry]" = OrderedDict()
+        self.replays = 0
+
+    def _begin(self, user_id: int, key: str, payload_fingerprint: str) -> Tuple[_Entry, bool]:
+        # Returns the entry for the key and whether the caller owns it (must run the request)
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[(user_id, key)]
+                entry = None
+            if entry is not None:
+                if entry.fingerprint != payload_fingerprint:
+                    raise IdempotencyKeyReused()
+                self._entries.move_to_end((user_id, key))
+                self.replays += 1
+                return entry, False
+            while len(self._entries) >= self.max_entries:
+                if not self._evict_oldest_resolved():
+                    raise IdempotencyStoreFull()
+            entry = _Entry(fingerprint=payload_fingerprint)
+            self._entries[(user_id, key)] = entry
+            return entry, True
+
+    def _evict_oldest_resolved(self) -> bool:
+        # Called with the lock held. In-flight entries are skipped: there are at most
+        # as many as requests being served, so the scan stays short
+        for stale_key, stale in self._entries.items():
+            if stale.future.done():
+                del self._entries[stale_key] # Returns right away: no further iteration
+                return True
+        return False
+
+    def _finish(self, user_id: int, key: str, entry: _Entry, result_id: int) -> None:
+        entry.expires_at = time.monotonic() + self.ttl_seconds
+        entry.future.set_result(result_id)
+
+    def _fail(self, user_id: int, key: str, entry: _Entry, exc: BaseException) -> None:
+        # Nothing was created: forget the key so that a later retry runs again.
+        # Requests already waiting on it get the same error.
+        with self._lock:
+            if self._entries.get((user_id, key)) is entry:
+                del self._entries[(user_id, key)]
+        entry.future.set_exception(exc)
+
+    def run(self, user_id: int, key: str, payload_fingerprint: str, execute: Callable[[], int]) -> Tuple[int, bool]:
+        """
+        Run `execute` (which returns the id of what it created) once per key.
+        Returns (id, replayed); replayed is True when the id comes from an earlier request.
+        """
+        entry, owner = self._begin(user_id, key, payload_fingerprint)
+        if not owner:
+            return entry.future.result(), True
+        try:
+            result_id = execute()
+        except BaseException as e:
+            self._fail(user_id, key, entry, e)
+            raise
+        self._finish(user_id, key, entry, result_id)
+        return result_id, False
+
+    async def arun(
+        self, user_id: int, key: str, payload_fingerprint: str, execute: Callable[[], Awaitable[int]]
+    ) -> Tuple[int, bool]:
+        entry, owner = self._begin(user_id, key, payload_fingerprint)
+        if not owner:
+            return await asyncio.wrap_future(entry.future), True
+        try:
+            result_id = await execute()
+        except BaseException as e:
+            self._fail(user_id, key, entry, e)
+            raise
+        self._finish(user_id, key, entry, result_id)
+        return result_id, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "replays": self.replays}
+
+
+order_idempotency = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS, max_entries=settings.IDEMPOTENCY_MAX_KEYS
+)
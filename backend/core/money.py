@@ -0,0 +1,44 @@
+# backend/core/money.py
+# Money amounts: integer cents in the database, Decimal in Python, JSON numbers in the API.
+# Prices and totals used to be floats, so sums drifted (0.1 + 0.2 != 0.3) and stored
+# totals could disagree with their lines by a fraction of a cent. Cents add up exactly
+# in SQL aggregates, and Decimal amounts with two places multiply and add exactly in
+# Python; the conversion to float only happens when a response is serialized.
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Annotated, Optional, Union
+
+from pydantic import AfterValidator, Field, PlainSerializer
+
+CENT = Decimal("0.01")
+# Largest amount a client can send. The columns hold 64-bit cents (up to ~9.2e16 in
+# dollars); staying far below leaves room for order totals and revenue sums
+MAX_AMOUNT = Decimal("999999999.99")
+
+def to_decimal(amount: Union[Decimal, float, int, str]) -> Decimal:
+    """Round an amount to whole cents (half up). Floats are read through their shortest repr, so 32.5 is 32.50."""
+    if isinstance(amount, float):
+        amount = repr(amount)
+    try:
+        return Decimal(amount).quantize(CENT, rounding=ROUND_HALF_UP)
+    except InvalidOperation: # Too many digits for the context precision, or not a number
+        raise ValueError(f"Invalid amount: {amount}")
+
+def to_cents(amount: Union[Decimal, float, int, str]) -> int:
+    return int(to_decimal(amount) * 100)
+
+def from_cents(cents: Union[int, float]) -> Decimal:
+    # Columns migrated from REAL keep their affinity on SQLite and read back as floats
+    # (holding whole numbers, so the conversion is exact)
+    return Decimal(int(round(cents))) * CENT
+
+def line_total(unit_price: Optional[Decimal], quantity: int) -> Optional[Decimal]:
+    return None if unit_price is None else unit_price * quantity
+
+# Schema fields holding amounts: accept numbers (or numeric strings) from 0 to
+# MAX_AMOUNT, rounded to cents, and serialize to a JSON number
+Money = Annotated[
+    Decimal, Field(ge=0, le=MAX_AMOUNT), AfterValidator(to_decimal),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+# Sums of amounts (order totals, revenue), computed by the app: not bounded by MAX_AMOUNT
+MoneyTotal = Annotated[Decimal, AfterValidator(to_decimal), PlainSerializer(float, return_type=float, when_used="json")]
@@ -0,0 +1,27 @@
+# backend/core/pagination.py
+# Opaque cursors for keyset pagination.
+# A cursor holds the key of the last row of a page; the next page is read with
+# "WHERE id > key" (or "<" for descending listings) instead of OFFSET, so every
+# page costs the same however deep the client goes.
+import base64
+import json
+from typing import Any, Type
+
+# List endpoints return the cursor of the next page in this header whenever the
+# page came back full, so existing clients keep their plain JSON array bodies
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(kind: str, last_key: Any) -> str:
+    raw = json.dumps([kind, last_key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(kind: str, cursor: str, key_type: Type) -> Any:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_kind, last_key = json.loads(raw)
+    except (ValueError, TypeError): # binascii.Error and JSONDecodeError are ValueErrors
+        raise ValueError("Invalid cursor")
+    # A cursor from another listing (or a bool passing as an int) is rejected too
+    if cursor_kind != kind or type(last_key) is not key_type:
+        raise ValueError("Invalid cursor")
+    return last_key
@@ -0,0 +1,218 @@
+# backend/core/profiling.py
+# Opt-in request profiling (PROFILING_ENABLED). A request is profiled when it carries
+# the PROFILING_HEADER (with PROFILING_TOKEN as its value, if one is set) or is picked
+# at PROFILING_SAMPLE_RATE. While it runs, a sampler thread reads the stack of every
+# thread (sys._current_frames) each PROFILING_INTERVAL_MS, and the counted stacks are
+# written to PROFILING_DIR in the collapsed ("folded") format read by flamegraph.pl,
+# inferno and speedscope, with a JSON file describing the request next to them.
+#
+# Sampling instead of cProfile: a sync route runs in a threadpool thread that cProfile
+# (per thread, started in the event loop) would not see, and the cost does not grow
+# with the number of function calls. The flip side is that the samples are per
+# process: requests handled at the same time show up too, each stack under its
+# thread's name ("MainThread" is the event loop, "AnyIO_worker_thread" the threadpool).
+# Idle threads (waiting on a lock, a queue or the selector) are left out.
+#
+# One profile is taken at a time; requests arriving meanwhile are not profiled.
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.config import settings
+from core.metrics import route_template
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+PROFILE_ID_PATTERN = r"^\d{8}T\d{12}Z-[0-9a-f]{8}$"
+_PROFILE_ID = re.compile(PROFILE_ID_PATTERN)
+
+# Leaf frames of a thread with nothing to do
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+
+_BACKEND_DIR = str(Path(__file__).resolve().parent.parent) + os.sep
+
+@dataclass
+class Profile:
+    id: str
+    method: str
+    path: str
+    started_at: str # ISO 8601, UTC
+    interval_ms: float
+    route: str = ""
+    status: int = 500 # If the app fails before starting a response
+    duration_ms: float = 0.0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter, repr=False) # "thread;outer;...;leaf" -> samples
+
+    def metadata(self) -> Dict:
+        data = asdict(self)
+        del data["stacks"]
+        return data
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def _frame_label(code, labels: Dict) -> str:
+    label = labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(_BACKEND_DIR):
+            filename = filename[len(_BACKEND_DIR):]
+        elif "site-packages" + os.sep in filename:
+            filename = filename.rsplit("site-packages" + os.sep, 1)[1]
+        else:
+            filename = os.path.basename(filename)
+        # ";" separates frames and " " the count in the folded format
+        label = labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+class StackSampler(threading.Thread):
+    """Counts the stacks of the other threads into `profile` until stop() is called."""
+
+    def __init__(self, profile: Profile, on_finish):
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self._on_finish = on_finish
+        self._stopped = threading.Event()
+        self._labels: Dict = {} # code object -> frame label
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        interval = self.profile.interval_ms / 1000
+        try:
+            while not self._stopped.wait(interval):
+                self._sample()
+        finally:
+            self._on_finish(self.profile)
+
+    def _sample(self) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code, self._labels))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}").replace(";", ":").replace(" ", "_"))
+            stack.reverse()
+            self.profile.stacks[";".join(stack)] += 1
+        self.profile.samples += 1
+
+class ProfileStore:
+    """The profiles in a directory: <id>.folded (the stacks) and <id>.json (the request)."""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, profile: Profile) -> None:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile.id}.folded").write_text(profile.folded())
+            (self.directory / f"{profile.id}.json").write_text(json.dumps(profile.metadata()))
+            self._prune()
+
+    def _prune(self) -> None:
+        # Ids start with their UTC timestamp, so name order is age order
+        for stale in sorted(self.directory.glob("*.json"))[:-self.max_profiles or None]:
+            stale.unlink(missing_ok=True)
+            stale.with_suffix(".folded").unlink(missing_ok=True)
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        """Metadata of the most recent profiles, newest first."""
+        if not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[:limit]:
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (OSError, ValueError): # Pruned or being written meanwhile
+                continue
+        return profiles
+
+    def folded(self, profile_id: str) -> Optional[str]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        try:
+            return (self.directory / f"{profile_id}.folded").read_text()
+        except FileNotFoundError:
+            return None
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_PROFILES)
+
+_busy = threading.Lock() # Held from the start of a profile until it is saved
+
+def _requested(scope) -> bool:
+    header = settings.PROFILING_HEADER.lower().encode()
+    for name, value in scope.get("headers", []):
+        if name == header:
+            return settings.PROFILING_TOKEN is None or value.decode("latin-1") == settings.PROFILING_TOKEN
+    return False
+
+def _finish(profile: Profile) -> None:
+    try:
+        profile_store.save(profile)
+    finally:
+        _busy.release()
+
+class ProfilingMiddleware:
+    """ASGI middleware: profiles the requests picked as described above."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (
+            _requested(scope) or random.random() < settings.PROFILING_SAMPLE_RATE
+        ) or not _busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        started_at = datetime.now(timezone.utc)
+        profile = Profile(
+            id=f"{started_at:%Y%m%dT%H%M%S%fZ}-{uuid.uuid4().hex[:8]}",
+            method=scope["method"], path=scope["path"],
+            started_at=started_at.isoformat(), interval_ms=settings.PROFILING_INTERVAL_MS,
+        )
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.lower().encode(), profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        sampler = StackSampler(profile, _finish)
+        try:
+            sampler.start()
+        except BaseException:
+            _busy.release()
+            raise
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            profile.route = route_template(scope)
+            sampler.stop() # The sampler thread saves the profile and releases _busy
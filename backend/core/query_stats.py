@@ -0,0 +1,109 @@
+# backend/core/query_stats.py
+# Per-request SQL statistics.
+# install() hooks the engine's before/after_cursor_execute events; while a request
+# is being handled (QueryStatsMiddleware), every statement run on its behalf is
+# counted and timed in a QueryStats held in a context variable. Sync routes run in
+# the threadpool with a copy of the request's context, and async sessions run the
+# statements in the request's task, so both land in the same QueryStats. Work done
+# by other threads (e.g. the order batcher's writer) is not attributed to a request.
+#
+# The totals go out in a Server-Timing header (db;dur=<ms>;desc="<n> queries"), and a
+# statement repeated SQL_REPEATED_STATEMENT_WARNING times within one request is logged
+# as a likely N+1 (a query per row instead of one for the page).
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter) # SQL text -> executions
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        noun = "query" if self.queries == 1 else "queries"
+        return f'db;dur={self.seconds * 1000:.3f};desc="{self.queries} {noun}"'
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Collect the statements run in this context (and the threads it hands work to)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._query_stats_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is None or started is None:
+        return
+    stats.seconds += time.perf_counter() - started
+    stats.queries += 1 # An executemany is one round trip
+    stats.statements[statement] += 1
+
+def install(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def warn_repeated(stats: QueryStats, method: str, path: str) -> None:
+    threshold = settings.SQL_REPEATED_STATEMENT_WARNING
+    if not threshold:
+        return
+    for statement, count in stats.repeated(threshold):
+        logger.warning(
+            "Possible N+1: %s %s ran the same statement %d times (%d queries in total): %s",
+            method, path, count, stats.queries, " ".join(statement.split())[:300],
+        )
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware: tracks the statements of each HTTP request and adds the
+    Server-Timing header. Statements run while a streamed body is being sent
+    come after the headers, so they are left out of it (but not of the N+1 check).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((SERVER_TIMING_HEADER.lower().encode(), stats.server_timing().encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                warn_repeated(stats, scope["method"], scope["path"])
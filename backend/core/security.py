@@ -1,6 +1,10 @@
 # backend/core/security.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -11,11 +15,95 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing queue is full; main.py turns it into 503 + Retry-After."""
+
+class PasswordHashingPool:
+    """
+    Runs bcrypt on a small dedicated thread pool (bcrypt releases the GIL, so threads
+    give real parallelism) behind an admission limit: a burst of logins waits here
+    for a bounded number of slots, or is rejected, instead of occupying every thread
+    of the request threadpool and stalling unrelated endpoints.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self.in_flight = 0 # Queued + running
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.queue_wait_seconds_total = 0.0
+
+    def _timed(self, submitted_at: float, fn: Callable[..., Any], *args: Any) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self.completed += 1
+                self.hash_seconds_total += elapsed
+                self.hash_seconds_max = max(self.hash_seconds_max, elapsed)
+                self.queue_wait_seconds_total += started_at - submitted_at
+
+    def _admit(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._admit()
+        try:
+            return self._executor.submit(self._timed, time.perf_counter(), fn, *args).result()
+        finally:
+            self._release()
+
+    async def arun(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # Same as run(), but awaits the result instead of blocking the event loop
+        self._admit()
+        try:
+            return await asyncio.wrap_future(self._executor.submit(self._timed, time.perf_counter(), fn, *args))
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "hash_seconds_total": self.hash_seconds_total,
+                "hash_seconds_max": self.hash_seconds_max,
+                "queue_wait_seconds_total": self.queue_wait_seconds_total,
+            }
+
+password_hashing_pool = PasswordHashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS, queue_size=settings.PASSWORD_HASH_QUEUE_SIZE
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hashing_pool.run(pwd_context.hash, password)
+
+# Variants for async routes (see api/routes/aio)
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hashing_pool.arun(pwd_context.verify, plain_password, hashed_password)
+
+async def aget_password_hash(password: str) -> str:
+    return await password_hashing_pool.arun(pwd_context.hash, password)
 
 # JWT Token Creation
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -0,0 +1,6 @@
+# backend/crud/aio/__init__.py
+# Async counterparts of the crud modules, for AsyncSession (DATABASE_ASYNC_MODE).
+# Each function runs the sync implementation through AsyncSession.run_sync, so the
+# queries, cache invalidation and business rules stay in one place while the
+# driver I/O is awaited. Results are returned as schema snapshots, converted inside
+# run_sync: ORM instances must not be touched outside the session's greenlet.
@@ -0,0 +1,51 @@
+# backend/crud/aio/crud_menu.py
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import crud_menu
+from schemas import menu as menu_schemas
+
+def _snapshot(db_menu_item) -> Optional[menu_schemas.MenuItem]:
+    return menu_schemas.MenuItem.model_validate(db_menu_item) if db_menu_item else None
+
+def _snapshots(db_menu_items) -> List[menu_schemas.MenuItem]:
+    return [menu_schemas.MenuItem.model_validate(db_menu_item) for db_menu_item in db_menu_items]
+
+async def get_menu_item(db: AsyncSession, menu_item_id: str) -> Optional[menu_schemas.MenuItem]:
+    return await db.run_sync(lambda session: _snapshot(crud_menu.get_menu_item(session, menu_item_id)))
+
+async def get_menu_items(
+    db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+) -> List[menu_schemas.MenuItem]:
+    return await db.run_sync(lambda session: _snapshots(crud_menu.get_menu_items(session, skip, limit, after_id)))
+
+async def get_menu_items_by_category(
+    db: AsyncSession, category: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+) -> List[menu_schemas.MenuItem]:
+    return await db.run_sync(
+        lambda session: _snapshots(crud_menu.get_menu_items_by_category(session, category, skip, limit, after_id))
+    )
+
+async def create_menu_item(db: AsyncSession, menu_item: menu_schemas.MenuItemCreate) -> menu_schemas.MenuItem:
+    return await db.run_sync(lambda session: _snapshot(crud_menu.create_menu_item(session, menu_item)))
+
+async def update_menu_item(
+    db: AsyncSession, menu_item_id: str, menu_item_update: menu_schemas.MenuItemUpdate
+) -> Optional[menu_schemas.MenuItem]:
+    return await db.run_sync(
+        lambda session: _snapshot(crud_menu.update_menu_item(session, menu_item_id, menu_item_update))
+    )
+
+async def delete_menu_item(db: AsyncSession, menu_item_id: str) -> Optional[menu_schemas.MenuItem]:
+    return await db.run_sync(lambda session: _snapshot(crud_menu.delete_menu_item(session, menu_item_id)))
+
+async def import_menu_items(
+    db: AsyncSession, items: List[menu_schemas.MenuItemCreate], replace: bool = False, dry_run: bool = False
+) -> menu_schemas.MenuImportResult:
+    return await db.run_sync(lambda session: crud_menu.import_menu_items(session, items, replace, dry_run))
+
+async def search_menu_items(
+    db: AsyncSession, query: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+) -> List[menu_schemas.MenuItem]:
+    return await db.run_sync(lambda session: _snapshots(crud_menu.search_menu_items(session, query, skip, limit, after_id)))
@@ -0,0 +1,32 @@
+# backend/crud/aio/crud_order.py
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import crud_order
+from schemas import order as order_schemas
+
+def _snapshot(db_order) -> Optional[order_schemas.Order]:
+    return order_schemas.Order.model_validate(db_order) if db_order else None
+
+def _snapshots(db_orders) -> List[order_schemas.Order]:
+    return [order_schemas.Order.model_validate(db_order) for db_order in db_orders]
+
+async def create_order(db: AsyncSession, order: order_schemas.OrderCreate, user_id: int) -> order_schemas.Order:
+    # Raises ValueError for unknown menu items, like the sync version
+    return await db.run_sync(lambda session: _snapshot(crud_order.create_order(session, order, user_id)))
+
+async def get_order(db: AsyncSession, order_id: int) -> Optional[order_schemas.Order]:
+    return await db.run_sync(lambda session: _snapshot(crud_order.get_order(session, order_id)))
+
+async def get_orders(
+    db: AsyncSession, skip: int = 0, limit: int = 100, before_id: Optional[int] = None
+) -> List[order_schemas.Order]:
+    return await db.run_sync(lambda session: _snapshots(crud_order.get_orders(session, skip, limit, before_id)))
+
+async def get_orders_by_user(
+    db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, before_id: Optional[int] = None
+) -> List[order_schemas.Order]:
+    return await db.run_sync(
+        lambda session: _snapshots(crud_order.get_orders_by_user(session, user_id, skip, limit, before_id))
+    )
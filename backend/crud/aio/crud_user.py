@@ -0,0 +1,47 @@
+# backend/crud/aio/crud_user.py
+# Password hashing is awaited on the hashing pool *before* entering run_sync,
+# so bcrypt never runs on the event loop thread.
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import security
+from crud import crud_user
+from schemas import user as user_schemas
+
+# UserInDB includes hashed_password, which login and password change need
+def _snapshot(db_user) -> Optional[user_schemas.UserInDB]:
+    return user_schemas.UserInDB.model_validate(db_user) if db_user else None
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[user_schemas.UserInDB]:
+    return await db.run_sync(lambda session: _snapshot(crud_user.get_user(session, user_id)))
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[user_schemas.UserInDB]:
+    return await db.run_sync(lambda session: _snapshot(crud_user.get_user_by_email(session, email)))
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[user_schemas.UserInDB]:
+    return await db.run_sync(lambda session: [_snapshot(db_user) for db_user in crud_user.get_users(session, skip, limit)])
+
+async def create_user(db: AsyncSession, user: user_schemas.UserCreate) -> user_schemas.UserInDB:
+    hashed_password = await security.aget_password_hash(user.password)
+    return await db.run_sync(lambda session: _snapshot(crud_user.insert_user(session, user.email, hashed_password)))
+
+async def update_user(
+    db: AsyncSession, user_id: int, user_update: user_schemas.UserUpdate
+) -> Optional[user_schemas.UserInDB]:
+    hashed_password = None
+    if user_update.password:
+        hashed_password = await security.aget_password_hash(user_update.password)
+    return await db.run_sync(
+        lambda session: _snapshot(crud_user.update_user(session, user_id, user_update, hashed_password=hashed_password))
+    )
+
+async def update_password(db: AsyncSession, user_id: int, new_password: str) -> Optional[user_schemas.UserInDB]:
+    hashed_password = await security.aget_password_hash(new_password)
+    def _update(session):
+        db_user = crud_user.get_user(session, user_id)
+        return _snapshot(crud_user.set_password_hash(session, db_user, hashed_password)) if db_user else None
+    return await db.run_sync(_update)
+
+async def delete_user(db: AsyncSession, user_id: int) -> Optional[user_schemas.UserInDB]:
+    return await db.run_sync(lambda session: _snapshot(crud_user.delete_user(session, user_id)))
@@ -0,0 +1,172 @@
+# backend/crud/crud_analytics.py
+# Sales analytics backed by the daily rollup tables (models.SalesDailyItem and
+# models.SalesDailyCategory). Order creation adds each order to the rollups in its
+# own transaction (record_orders), so the reports below aggregate a handful of rows
+# per day whatever the size of the order history. rebuild_rollups recomputes the
+# tables from order_items with a GROUP BY, for backfills and consistency checks.
+# Both use the price and category each line recorded when it was ordered, so a
+# rebuild reproduces the history even after items are repriced, moved to another
+# category or deleted.
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import models
+from schemas import analytics as analytics_schemas
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+def _upsert(db: Session, table, key_columns: Tuple[str, ...], rows: List[dict]) -> None:
+    # Adds units/revenue/orders of `rows` to the existing rollup rows, creating missing ones
+    if not rows:
+        return
+    upsert_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert_insert is not None:
+        stmt = upsert_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: table.c[column] + stmt.excluded[column] for column in ("units", "revenue", "orders")},
+        )
+        db.execute(stmt, rows)
+        return
+    for row in rows: # Portable fallback: update, insert if nothing was there
+        key = [table.c[column] == row[column] for column in key_columns]
+        result = db.execute(
+            update(table).where(*key).values(
+                units=table.c.units + row["units"], revenue=table.c.revenue + row["revenue"], orders=table.c.orders + row["orders"]
+            )
+        )
+        if not result.rowcount:
+            db.execute(insert(table).values(**row))
+
+def record_orders(db: Session, orders: Iterable[models.Order]) -> None:
+    """Add new orders to the rollups. Runs in the caller's transaction, before its commit."""
+    by_item: Dict[Tuple[date, str], dict] = {}
+    by_category: Dict[Tuple[date, str], dict] = {}
+    for order in orders:
+        day = order.created_at.date()
+        categories = set()
+        for order_item in order.items:
+            revenue = order_item.unit_price * order_item.quantity
+            for totals, key in ((by_item, (day, order_item.menu_item_id)), (by_category, (day, order_item.category))):
+                row = totals.setdefault(key, {"units": 0, "revenue": 0, "orders": 0})
+                row["units"] += order_item.quantity
+                row["revenue"] += revenue
+            by_item[(day, order_item.menu_item_id)]["orders"] += 1 # Lines are merged per item
+            categories.add(order_item.category)
+        for category in categories:
+            by_category[(day, category)]["orders"] += 1
+    _upsert(
+        db, models.SalesDailyItem.__table__, ("day", "menu_item_id"),
+        [{"day": day, "menu_item_id": menu_item_id, **row} for (day, menu_item_id), row in sorted(by_item.items())],
+    )
+    _upsert(
+        db, models.SalesDailyCategory.__table__, ("day", "category"),
+        [{"day": day, "category": category, **row} for (day, category), row in sorted(by_category.items())],
+    )
+
+def rebuild_rollups(db: Session, line_prices: bool = True, line_categories: bool = True) -> None:
+    """
+    Recompute both rollup tables from order_items in SQL (does not commit).
+    Revenue and category come from what each line recorded, or from the current menu
+    item for lines that have none; lines with no price either way (older lines of
+    deleted items) are left out, and from the category table lines with no category.
+    line_prices/line_categories=False always use the menu item, for the migrations
+    that run before order_items has the unit_price (3) or category (6) column.
+    """
+    day = func.date(models.Order.created_at)
+    unit_price = models.MenuItem.price
+    if line_prices:
+        unit_price = func.coalesce(models.OrderItem.unit_price, unit_price)
+    category = models.MenuItem.category
+    if line_categories:
+        category = func.coalesce(models.OrderItem.category, category)
+    line_revenue = unit_price * models.OrderItem.quantity
+    lines = (
+        select(
+            day.label("day"),
+            models.OrderItem.menu_item_id,
+            category.label("category"),
+            models.OrderItem.order_id,
+            models.OrderItem.quantity,
+            line_revenue.label("revenue"),
+        )
+        .join(models.Order, models.Order.id == models.OrderItem.order_id)
+        .outerjoin(models.MenuItem, models.MenuItem.id == models.OrderItem.menu_item_id) # Deleted items too
+        .where(line_revenue.is_not(None))
+        .subquery()
+    )
+    db.execute(delete(models.SalesDailyItem))
+    db.execute(delete(models.SalesDailyCategory))
+    db.execute(
+        insert(models.SalesDailyItem).from_select(
+            ["day", "menu_item_id", "units", "revenue", "orders"],
+            select(
+                lines.c.day, lines.c.menu_item_id, func.sum(lines.c.quantity), func.sum(lines.c.revenue),
+                func.count(func.distinct(lines.c.order_id)),
+            ).group_by(lines.c.day, lines.c.menu_item_id),
+        )
+    )
+    db.execute(
+        insert(models.SalesDailyCategory).from_select(
+            ["day", "category", "units", "revenue", "orders"],
+            select(
+                lines.c.day, lines.c.category, func.sum(lines.c.quantity), func.sum(lines.c.revenue),
+                func.count(func.distinct(lines.c.order_id)),
+            ).where(lines.c.category.is_not(None)).group_by(lines.c.day, lines.c.category),
+        )
+    )
+
+def _in_range(query, day_column, start: Optional[date], end: Optional[date]):
+    if start is not None:
+        query = query.where(day_column >= start)
+    if end is not None:
+        query = query.where(day_column <= end)
+    return query
+
+def get_top_sellers(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None, limit: int = 10, by: str = "units"
+) -> List[analytics_schemas.TopSeller]:
+    rollup = models.SalesDailyItem
+    units = func.sum(rollup.units).label("units")
+    revenue = func.sum(rollup.revenue).label("revenue")
+    query = (
+        select(rollup.menu_item_id, models.MenuItem.name, units, revenue, func.sum(rollup.orders).label("orders"))
+        .outerjoin(models.MenuItem, models.MenuItem.id == rollup.menu_item_id) # Deleted items keep their sales
+        .group_by(rollup.menu_item_id, models.MenuItem.name)
+        .order_by((revenue if by == "revenue" else units).desc(), rollup.menu_item_id)
+        .limit(limit)
+    )
+    rows = db.execute(_in_range(query, rollup.day, start, end)).all()
+    return [analytics_schemas.TopSeller.model_validate(row) for row in rows]
+
+def get_revenue_by_category(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None
+) -> List[analytics_schemas.CategoryRevenue]:
+    rollup = models.SalesDailyCategory
+    revenue = func.sum(rollup.revenue).label("revenue")
+    query = (
+        select(rollup.category, func.sum(rollup.units).label("units"), revenue, func.sum(rollup.orders).label("orders"))
+        .group_by(rollup.category)
+        .order_by(revenue.desc(), rollup.category)
+    )
+    rows = db.execute(_in_range(query, rollup.day, start, end)).all()
+    return [analytics_schemas.CategoryRevenue.model_validate(row) for row in rows]
+
+def get_daily_revenue(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None, category: Optional[str] = None
+) -> List[analytics_schemas.DailyRevenue]:
+    rollup = models.SalesDailyCategory
+    query = (
+        select(rollup.day, func.sum(rollup.units).label("units"), func.sum(rollup.revenue).label("revenue"))
+        .group_by(rollup.day)
+        .order_by(rollup.day)
+    )
+    if category is not None:
+        query = query.where(rollup.category == category)
+    rows = db.execute(_in_range(query, rollup.day, start, end)).all()
+    return [analytics_schemas.DailyRevenue.model_validate(row) for row in rows]
@@ -1,22 +1,43 @@
 # backend/crud/crud_menu.py
 from sqlalchemy.orm import Session
-from sqlalchemy import or_ # Import or_
-from typing import List, Optional
+from sqlalchemy import delete, exists, insert, or_, update # Import or_
+from typing import Dict, Iterable, List, Optional
 
 from database import models
 from schemas import menu as menu_schemas
+from . import menu_import
+from .menu_cache import menu_catalog # Invalidated by every write below
 
 # Get a single menu item by ID
 def get_menu_item(db: Session, menu_item_id: str) -> Optional[models.MenuItem]:
     return db.query(models.MenuItem).filter(models.MenuItem.id == menu_item_id).first()
 
-# Get all menu items with pagination
-def get_menu_items(db: Session, skip: int = 0, limit: int = 100) -> List[models.MenuItem]:
-    return db.query(models.MenuItem).offset(skip).limit(limit).all()
+# Get several menu items in one query, keyed by ID (unknown IDs are simply absent)
+def get_menu_items_by_ids(db: Session, menu_item_ids: Iterable[str]) -> Dict[str, models.MenuItem]:
+    ids = set(menu_item_ids)
+    if not ids:
+        return {}
+    rows = db.query(models.MenuItem).filter(models.MenuItem.id.in_(ids)).all()
+    return {row.id: row for row in rows}
+
+# Keyset pagination in ID order: only rows after the cursor key (skip is ignored then)
+def _page(query, skip: int, limit: int, after_id: Optional[str]) -> List[models.MenuItem]:
+    query = query.order_by(models.MenuItem.id)
+    if after_id is not None:
+        query = query.filter(models.MenuItem.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+# Get all menu items with pagination (skip/limit, or after_id for keyset pagination)
+def get_menu_items(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[models.MenuItem]:
+    return _page(db.query(models.MenuItem), skip, limit, after_id)
 
 # Get menu items by category
-def get_menu_items_by_category(db: Session, category: str, skip: int = 0, limit: int = 100) -> List[models.MenuItem]:
-    return db.query(models.MenuItem).filter(models.MenuItem.category == category).offset(skip).limit(limit).all()
+def get_menu_items_by_category(
+    db: Session, category: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+) -> List[models.MenuItem]:
+    return _page(db.query(models.MenuItem).filter(models.MenuItem.category == category), skip, limit, after_id)
 
 # Create a new menu item
 def create_menu_item(db: Session, menu_item: menu_schemas.MenuItemCreate) -> models.MenuItem:
@@ -31,6 +52,7 @@ def create_menu_item(db: Session, menu_item: menu_schemas.MenuItemCreate) -> mod
     db.add(db_menu_item)
     db.commit()
     db.refresh(db_menu_item)
+    menu_catalog.invalidate()
     return db_menu_item
 
 # Update an existing menu item
@@ -46,6 +68,7 @@ def update_menu_item(db: Session, menu_item_id: str, menu_item_update: menu_sche
     db.add(db_menu_item)
     db.commit()
     db.refresh(db_menu_item)
+    menu_catalog.invalidate()
     return db_menu_item
 
 # Delete a menu item
@@ -54,20 +77,73 @@ def delete_menu_item(db: Session, menu_item_id: str) -> Optional[models.MenuItem
     if db_menu_item:
         db.delete(db_menu_item)
         db.commit()
+        menu_catalog.invalidate()
     return db_menu_item
 
+# Those of `menu_item_ids` that order lines reference (a scan of order_items: there
+# is no index on menu_item_id, and only replace imports need this)
+def _referenced_menu_item_ids(db: Session, menu_item_ids: List[str]) -> set:
+    rows = (
+        db.query(models.OrderItem.menu_item_id)
+        .filter(models.OrderItem.menu_item_id.in_(menu_item_ids))
+        .distinct()
+    )
+    return {menu_item_id for (menu_item_id,) in rows}
+
+# Apply a whole catalog (see menu_import.py) in one transaction: new and changed
+# items in one INSERT ... ON CONFLICT DO UPDATE, unchanged ones left alone, and with
+# replace=True the items missing from the catalog deleted, except those that order
+# lines still reference (reported as kept: deleting them would break the foreign key,
+# or on SQLite orphan the lines). One cache invalidation for the whole import;
+# dry_run only computes the diff.
+def import_menu_items(
+    db: Session, items: List[menu_schemas.MenuItemCreate], replace: bool = False, dry_run: bool = False
+) -> menu_schemas.MenuImportResult:
+    if replace:
+        existing = db.query(models.MenuItem).all()
+    else:
+        existing = get_menu_items_by_ids(db, (item.id for item in items)).values()
+    diff = menu_import.diff_catalog(existing, items, replace)
+    if diff.deleted:
+        in_use = _referenced_menu_item_ids(db, diff.deleted)
+        diff.kept = [menu_item_id for menu_item_id in diff.deleted if menu_item_id in in_use]
+        diff.deleted = [menu_item_id for menu_item_id in diff.deleted if menu_item_id not in in_use]
+    changed = diff.created + diff.updated
+    if not dry_run and (changed or diff.deleted):
+        upsert = menu_import.upsert_statement(db.get_bind().dialect.name)
+        if changed and upsert is not None:
+            db.execute(upsert, changed)
+        elif changed: # Portable fallback
+            if diff.created:
+                db.execute(insert(models.MenuItem), diff.created)
+            if diff.updated:
+                db.execute(update(models.MenuItem), diff.updated) # Bulk UPDATE by primary key
+        if diff.deleted:
+            # Re-checked in the DELETE itself, for orders placed since the check above
+            referenced = exists().where(models.OrderItem.menu_item_id == models.MenuItem.id)
+            db.execute(delete(models.MenuItem).where(models.MenuItem.id.in_(diff.deleted), ~referenced))
+        db.commit()
+        menu_catalog.invalidate()
+    return menu_schemas.MenuImportResult(
+        created=[row["id"] for row in diff.created],
+        updated=[row["id"] for row in diff.updated],
+        deleted=diff.deleted,
+        kept=diff.kept,
+        unchanged=diff.unchanged,
+        dry_run=dry_run,
+    )
+
 # NOVA FUNÇÃO: Search menu items by name or description
-def search_menu_items(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[models.MenuItem]:
+# The API searches the in-memory index instead (menu_search.py); this ILIKE scan is
+# kept as the database-side reference, e.g. for benchmarks/bench_menu_search.py
+def search_menu_items(
+    db: Session, query: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+) -> List[models.MenuItem]:
     search_query = f"%{query}%"
-    return (
-        db.query(models.MenuItem)
-        .filter(
-            or_(
-                models.MenuItem.name.ilike(search_query),
-                models.MenuItem.description.ilike(search_query)
-            )
+    db_query = db.query(models.MenuItem).filter(
+        or_(
+            models.MenuItem.name.ilike(search_query),
+            models.MenuItem.description.ilike(search_query)
         )
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
\ No newline at end of file
+    )
+    return _page(db_query, skip, limit, after_id)
@@ -1,61 +1,149 @@
 # backend/crud/crud_order.py
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from decimal import Decimal
+from sqlalchemy import func, select, type_coerce, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Dict, List, NamedTuple, Optional
 
+from core.config import settings
 from database import models
 from schemas import order as order_schemas
-from . import crud_menu # To fetch menu item details like price
+from . import crud_analytics, crud_menu # crud_menu to fetch menu item details like price
+from .recommendations import recommender
 
-# Create a new order
-def create_order(db: Session, order: order_schemas.OrderCreate, user_id: int) -> models.Order:
-    total_price = 0
-    db_order_items = []
+# Sum the quantities of lines that refer to the same menu item, keeping first-seen order
+def merge_order_lines(items: List[order_schemas.OrderItemCreate]) -> Dict[str, int]:
+    quantities: Dict[str, int] = {}
+    for item_in in items:
+        quantities[item_in.menu_item_id] = quantities.get(item_in.menu_item_id, 0) + item_in.quantity
+    return quantities
 
-    for item_in in order.items:
-        menu_item = crud_menu.get_menu_item(db, item_in.menu_item_id)
-        if not menu_item:
-            # Handle error: menu item not found. 
-            # This could raise an HTTPException in the route or be handled here.
-            # For now, we'll skip items not found, but in a real app, you'd want robust error handling.
-            # Consider raising ValueError or a custom exception.
-            raise ValueError(f"Menu item with id {item_in.menu_item_id} not found.")
-        
-        total_price += menu_item.price * item_in.quantity
+# Build (but do not add) an order from its lines, given the menu items they refer to
+def build_order(order: order_schemas.OrderCreate, user_id: int, menu_items: Dict[str, models.MenuItem]) -> models.Order:
+    quantities = merge_order_lines(order.items)
+    missing = [menu_item_id for menu_item_id in quantities if menu_item_id not in menu_items]
+    if missing:
+        # Report all unknown items at once so the client can fix the cart in one go
+        raise ValueError(f"Menu items not found: {', '.join(missing)}.")
+
+    total_price = Decimal(0) # Prices are Decimal amounts in cents: the sum is exact
+    db_order_items = []
+    for menu_item_id, quantity in quantities.items():
+        menu_item = menu_items[menu_item_id]
+        total_price += menu_item.price * quantity
         db_order_item = models.OrderItem(
-            menu_item_id=item_in.menu_item_id,
-            quantity=item_in.quantity
+            menu_item_id=menu_item_id,
+            quantity=quantity,
+            unit_price=menu_item.price,
+            name=menu_item.name,
+            category=menu_item.category,
             # order_id will be set when the Order is created and relationships are flushed
         )
         db_order_items.append(db_order_item)
     
-    db_order = models.Order(
+    return models.Order(
         user_id=user_id, 
         total_price=total_price, 
+        created_at=models.utcnow(), # Set now rather than at flush: the sales rollups need the day
         items=db_order_items # SQLAlchemy will handle associating these OrderItems with the Order
     )
+
+# Create a new order
+def create_order(db: Session, order: order_schemas.OrderCreate, user_id: int) -> models.Order:
+    # Resolve every referenced menu item in a single query instead of one per line
+    menu_items = crud_menu.get_menu_items_by_ids(db, {item_in.menu_item_id for item_in in order.items})
+    db_order = build_order(order, user_id, menu_items)
     db.add(db_order)
+    crud_analytics.record_orders(db, [db_order]) # Same transaction as the order
     db.commit()
     db.refresh(db_order) # Refresh to get IDs and relationships populated
+    recommender.record_order(db_order.id, [item.menu_item_id for item in db_order.items])
     return db_order
 
+# Fill the price/name snapshot of order lines recorded before it existed, from the
+# current menu (the closest information available). Returns the number of lines updated.
+def backfill_order_item_snapshots(db: Session) -> int:
+    menu_item = select(models.MenuItem).where(models.MenuItem.id == models.OrderItem.menu_item_id)
+    result = db.execute(
+        update(models.OrderItem)
+        .where(models.OrderItem.unit_price.is_(None), menu_item.exists())
+        .values(
+            unit_price=menu_item.with_only_columns(models.MenuItem.price).scalar_subquery(),
+            name=menu_item.with_only_columns(models.MenuItem.name).scalar_subquery(),
+        )
+    )
+    return result.rowcount
+
+# Same for the category snapshot, which order lines record since migration 6
+def backfill_order_item_categories(db: Session) -> int:
+    menu_item = select(models.MenuItem).where(models.MenuItem.id == models.OrderItem.menu_item_id)
+    result = db.execute(
+        update(models.OrderItem)
+        .where(models.OrderItem.category.is_(None), menu_item.exists())
+        .values(category=menu_item.with_only_columns(models.MenuItem.category).scalar_subquery())
+    )
+    return result.rowcount
+
+class OrderTotalMismatch(NamedTuple):
+    order_id: int
+    stored: Decimal
+    computed: Decimal
+
+# Check every stored order total against the sum of its lines, in one aggregate query
+# (exact: amounts are integer cents). Orders with a line missing its price are skipped.
+# With fix=True the mismatching totals are overwritten in bulk (the caller commits).
+def retotal_orders(db: Session, fix: bool = False) -> List[OrderTotalMismatch]:
+    line_total = type_coerce(models.OrderItem.unit_price * models.OrderItem.quantity, models.Cents)
+    computed = (
+        select(models.OrderItem.order_id, func.sum(line_total).label("total"))
+        .group_by(models.OrderItem.order_id)
+        .having(func.count(models.OrderItem.unit_price) == func.count())
+        .subquery()
+    )
+    rows = db.execute(
+        select(models.Order.id, models.Order.total_price, computed.c.total)
+        .join(computed, computed.c.order_id == models.Order.id)
+        .where(models.Order.total_price != computed.c.total)
+        .order_by(models.Order.id)
+    ).all()
+    mismatches = [OrderTotalMismatch(*row) for row in rows]
+    if fix and mismatches:
+        db.execute(
+            update(models.Order),
+            [{"id": mismatch.order_id, "total_price": mismatch.computed} for mismatch in mismatches],
+        )
+    return mismatches
+
+# Base query for order reads: loads Order.items in bulk, so serializing a page of
+# orders does not lazy-load the items of each order separately (N+1 queries)
+def _orders_query(db: Session):
+    if settings.ORDER_ITEMS_LOAD_STRATEGY == "joined":
+        loader = joinedload(models.Order.items)
+    else:
+        loader = selectinload(models.Order.items)
+    return db.query(models.Order).options(loader)
+
 # Get a single order by ID
 def get_order(db: Session, order_id: int) -> Optional[models.Order]:
-    return db.query(models.Order).filter(models.Order.id == order_id).first()
+    return _orders_query(db).filter(models.Order.id == order_id).first()
+
+# Keyset pagination for the newest-first listings: only orders older than the cursor key (skip is ignored then)
+def _page(query, skip: int, limit: int, before_id: Optional[int]) -> List[models.Order]:
+    query = query.order_by(models.Order.id.desc())
+    if before_id is not None:
+        query = query.filter(models.Order.id < before_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 # Get all orders (e.g., for an admin)
-def get_orders(db: Session, skip: int = 0, limit: int = 100) -> List[models.Order]:
-    return db.query(models.Order).order_by(models.Order.id.desc()).offset(skip).limit(limit).all()
+def get_orders(db: Session, skip: int = 0, limit: int = 100, before_id: Optional[int] = None) -> List[models.Order]:
+    return _page(_orders_query(db), skip, limit, before_id)
 
 # Get orders for a specific user
-def get_orders_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Order]:
-    return (
-        db.query(models.Order)
-        .filter(models.Order.user_id == user_id)
-        .order_by(models.Order.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+def get_orders_by_user(
+    db: Session, user_id: int, skip: int = 0, limit: int = 100, before_id: Optional[int] = None
+) -> List[models.Order]:
+    return _page(_orders_query(db).filter(models.Order.user_id == user_id), skip, limit, before_id)
 
 # Note: Updating and Deleting orders can be complex due to business logic
 # (e.g., can't update a completed order, refunds, etc.).
@@ -5,6 +5,7 @@ from typing import Optional
 from database import models
 from schemas import user as user_schemas
 from core.security import get_password_hash
+from .user_cache import auth_user_cache # Cached sessions must see every change to a user
 
 def get_user(db: Session, user_id: int) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.id == user_id).first()
@@ -16,22 +17,29 @@ def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[models.User]
     return db.query(models.User).offset(skip).limit(limit).all()
 
 def create_user(db: Session, user: user_schemas.UserCreate) -> models.User:
-    hashed_password = get_password_hash(user.password)
-    db_user = models.User(email=user.email, hashed_password=hashed_password)
+    return insert_user(db, email=user.email, hashed_password=get_password_hash(user.password))
+
+# Store a user whose password is already hashed (async callers hash without blocking the loop)
+def insert_user(db: Session, email: str, hashed_password: str) -> models.User:
+    db_user = models.User(email=email, hashed_password=hashed_password)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
-def update_user(db: Session, user_id: int, user_update: user_schemas.UserUpdate) -> Optional[models.User]:
+# hashed_password: an already hashed new password, used instead of user_update.password
+def update_user(
+    db: Session, user_id: int, user_update: user_schemas.UserUpdate, hashed_password: Optional[str] = None
+) -> Optional[models.User]:
     db_user = get_user(db, user_id)
     if not db_user:
         return None
     
     update_data = user_update.model_dump(exclude_unset=True) # Pydantic v2
 
-    if "password" in update_data and update_data["password"]:
+    if hashed_password is None and "password" in update_data and update_data["password"]:
         hashed_password = get_password_hash(update_data["password"])
+    if hashed_password:
         db_user.hashed_password = hashed_password
     if "email" in update_data and update_data["email"]:
         db_user.email = update_data["email"]
@@ -41,6 +49,17 @@ def update_user(db: Session, user_id: int, user_update: user_schemas.UserUpdate)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    auth_user_cache.invalidate_user(db_user.id)
+    return db_user
+
+def update_password(db: Session, db_user: models.User, new_password: str) -> models.User:
+    return set_password_hash(db, db_user, get_password_hash(new_password))
+
+def set_password_hash(db: Session, db_user: models.User, hashed_password: str) -> models.User:
+    db_user.hashed_password = hashed_password
+    db.add(db_user)
+    db.commit()
+    auth_user_cache.invalidate_user(db_user.id)
     return db_user
 
 def delete_user(db: Session, user_id: int) -> Optional[models.User]:
@@ -48,4 +67,5 @@ def delete_user(db: Session, user_id: int) -> Optional[models.User]:
     if db_user:
         db.delete(db_user)
         db.commit()
+        auth_user_cache.invalidate_user(user_id)
     return db_user
@@ -0,0 +1,246 @@
+# backend/crud/menu_cache.py
+# In-process cache of the whole menu catalog.
+# The menu is small and changes rarely, so reads are served from an immutable
+# snapshot held in memory. The write functions in crud_menu call invalidate()
+# after committing, and the next read reloads the catalog in a single query.
+import asyncio
+import bisect
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Dict, Hashable, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core import pagination
+from core.config import settings
+from database import models
+from schemas import menu as menu_schemas
+from .menu_search import MenuSearchIndex
+from .menu_suggest import MenuSuggestIndex
+
+
+MAX_RENDERED_RESPONSES = 512 # Per snapshot; bounds memory when clients vary skip/limit or search terms
+
+_menu_item_adapter = TypeAdapter(menu_schemas.MenuItem)
+_menu_items_adapter = TypeAdapter(List[menu_schemas.MenuItem])
+
+
+def _page(items: List[menu_schemas.MenuItem], skip: int, limit: int, after_id: Optional[str]) -> List[menu_schemas.MenuItem]:
+    # Lists are ordered by id, so the keyset position is a binary search
+    if after_id is not None:
+        skip = bisect.bisect_right(items, after_id, key=lambda item: item.id)
+    return items[skip:skip + limit]
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    body: bytes
+    etag: str
+    next_cursor: Optional[str] = None
+
+    @classmethod
+    def from_body(cls, body: bytes, next_cursor: Optional[str] = None) -> "RenderedResponse":
+        # A digest of the bytes rather than the raw version number, so that every
+        # worker process (and a restarted one) hands out the same tag for the same menu.
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(body=body, etag=etag, next_cursor=next_cursor)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    loaded_at: float
+    items: List[menu_schemas.MenuItem] # Ordered by id
+    by_id: Dict[str, menu_schemas.MenuItem]
+    by_category: Dict[str, List[menu_schemas.MenuItem]]
+    # Ready-to-send JSON for this version, dropped together with the snapshot (oldest first)
+    rendered: "OrderedDict[Hashable, RenderedResponse]" = field(default_factory=OrderedDict, compare=False, repr=False)
+    # Threadpool threads render concurrently; build() runs outside the lock
+    _rendered_lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    @classmethod
+    def build(cls, version: int, rows: List[models.MenuItem]) -> "CatalogSnapshot":
+        # Snapshot plain schema objects, not ORM instances: ORM objects would be
+        # expired by the next commit of the session that loaded them.
+        items = [menu_schemas.MenuItem.model_validate(row) for row in rows]
+        by_category: Dict[str, List[menu_schemas.MenuItem]] = {}
+        for item in items:
+            by_category.setdefault(item.category, []).append(item)
+        return cls(
+            version=version,
+            loaded_at=time.monotonic(),
+            items=items,
+            by_id={item.id: item for item in items},
+            by_category=by_category,
+        )
+
+    def get_menu_items(self, skip: int = 0, limit: int = 100, after_id: Optional[str] = None) -> List[menu_schemas.MenuItem]:
+        return _page(self.items, skip, limit, after_id)
+
+    def get_menu_items_by_category(
+        self, category: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+    ) -> List[menu_schemas.MenuItem]:
+        return _page(self.by_category.get(category, []), skip, limit, after_id)
+
+    @cached_property
+    def search_index(self) -> MenuSearchIndex:
+        # Built on the first search against this version of the catalog
+        return MenuSearchIndex(self.items)
+
+    def search_menu_items(
+        self, query: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+    ) -> List[menu_schemas.MenuItem]:
+        if after_id is None:
+            return self.search_index.search(query, limit=skip + limit)[skip:]
+        # Results are ranked, not ordered by id: resume right after the cursor item
+        # (or stop if it no longer matches)
+        results = self.search_index.search(query)
+        positions = (index for index, item in enumerate(results) if item.id == after_id)
+        start = next(positions, len(results)) + 1
+        return results[start:start + limit]
+
+    def render(self, key: Hashable, build: Callable[[], object], page_limit: Optional[int] = None) -> RenderedResponse:
+        with self._rendered_lock:
+            rendered = self.rendered.get(key)
+        if rendered is not None:
+            return rendered
+        value = build()
+        adapter = _menu_items_adapter if isinstance(value, list) else _menu_item_adapter
+        next_cursor = None
+        if page_limit and isinstance(value, list) and len(value) == page_limit:
+            next_cursor = pagination.encode_cursor("menu", value[-1].id)
+        rendered = RenderedResponse.from_body(adapter.dump_json(value), next_cursor)
+        with self._rendered_lock:
+            if key in self.rendered: # Rendered by another thread meanwhile
+                return self.rendered[key]
+            while len(self.rendered) >= MAX_RENDERED_RESPONSES:
+                self.rendered.popitem(last=False) # The oldest entry
+            self.rendered[key] = rendered
+        return rendered
+
+
+class MenuCatalogCache:
+    def __init__(self, ttl_seconds: int = 0):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._generation = 0 # Bumped by invalidate()
+        self._load_lock = threading.Lock() # One loader at a time; also serializes invalidation
+        # Async loaders await the query, so they must not hold _load_lock meanwhile:
+        # that would block the event loop for every other coroutine wanting the lock.
+        self._async_load_lock = asyncio.Lock()
+        self._stats_lock = threading.Lock()
+        # Outlives the snapshots: each reload only re-indexes the items that changed
+        self.suggestions = MenuSuggestIndex()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _is_fresh(self, snapshot: CatalogSnapshot) -> bool:
+        return not self.ttl_seconds or time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _current(self) -> Optional[CatalogSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self._is_fresh(snapshot):
+            self._count("hits")
+            return snapshot
+        self._count("evictions") # Expired by TTL
+        self._snapshot = None
+        return None
+
+    def _publish(self, rows: List[models.MenuItem], generation: int) -> CatalogSnapshot:
+        # Called with _load_lock held
+        self._version += 1
+        snapshot = CatalogSnapshot.build(self._version, rows)
+        if generation == self._generation: # Not invalidated while the rows were loading
+            self.suggestions.sync(snapshot.items)
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self, db: Session) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot):
+            self._count("hits")
+            return snapshot
+        with self._load_lock:
+            # Another request may have reloaded the catalog while we waited
+            snapshot = self._current()
+            if snapshot is not None:
+                return snapshot
+            self._count("misses")
+            rows = db.query(models.MenuItem).order_by(models.MenuItem.id).all()
+            return self._publish(rows, self._generation)
+
+    async def asnapshot(self, db: AsyncSession) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot):
+            self._count("hits")
+            return snapshot
+        async with self._async_load_lock:
+            snapshot = self._current()
+            if snapshot is not None:
+                return snapshot
+            self._count("misses")
+            generation = self._generation
+            rows = (await db.scalars(select(models.MenuItem).order_by(models.MenuItem.id))).all()
+            with self._load_lock:
+                return self._publish(rows, generation)
+
+    def invalidate(self) -> None:
+        # Taking the load lock guarantees that a load which started before the
+        # caller's commit cannot publish its stale snapshot afterwards.
+        with self._load_lock:
+            self._generation += 1
+            if self._snapshot is not None:
+                self._count("evictions")
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, int]:
+        snapshot = self._snapshot
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "version": snapshot.version if snapshot else 0,
+                "items": len(snapshot.items) if snapshot else 0,
+            }
+
+    # Read API mirroring crud_menu
+
+    def get_menu_item(self, db: Session, menu_item_id: str) -> Optional[menu_schemas.MenuItem]:
+        return self.snapshot(db).by_id.get(menu_item_id)
+
+    def get_menu_items(
+        self, db: Session, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+    ) -> List[menu_schemas.MenuItem]:
+        return self.snapshot(db).get_menu_items(skip=skip, limit=limit, after_id=after_id)
+
+    def get_menu_items_by_category(
+        self, db: Session, category: str, skip: int = 0, limit: int = 100, after_id: Optional[str] = None
+    ) -> List[menu_schemas.MenuItem]:
+        return self.snapshot(db).get_menu_items_by_category(category, skip=skip, limit=limit, after_id=after_id)
+
+    def suggest(self, db: Session, prefix: str, limit: int = 10) -> List[menu_schemas.MenuSuggestion]:
+        self.snapshot(db) # Makes sure the index reflects the current catalog
+        return self.suggestions.suggest(prefix, limit=limit)
+
+    async def asuggest(self, db: AsyncSession, prefix: str, limit: int = 10) -> List[menu_schemas.MenuSuggestion]:
+        await self.asnapshot(db)
+        return self.suggestions.suggest(prefix, limit=limit)
+
+
+menu_catalog = MenuCatalogCache(ttl_seconds=settings.MENU_CACHE_TTL_SECONDS)
@@ -0,0 +1,140 @@
+# backend/crud/menu_import.py
+# Bulk menu import (POST /api/v1/menu/import): a whole catalog as JSON (an array of
+# menu items), NDJSON (one item per line) or CSV (a header row with the MenuItemCreate
+# fields), compared with the menu in the database and applied by
+# crud_menu.import_menu_items in one transaction.
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import models
+from schemas import menu as menu_schemas
+
+CATALOG_FORMATS = {"json": "application/json", "ndjson": "application/x-ndjson", "csv": "text/csv"}
+_CONTENT_TYPES = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+MAX_CATALOG_BYTES = 5 * 1024 * 1024
+MAX_REPORTED_ERRORS = 50
+
+# Fields an import sets; an item's missing optional fields are cleared
+IMPORTED_FIELDS = ("name", "description", "price", "category", "imageUrl")
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+class CatalogError(ValueError):
+    """The catalog cannot be imported; `errors` lists the rejected rows (row, id, errors)."""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__(f"{len(errors)} invalid catalog rows")
+        self.errors = errors
+
+def format_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    return _CONTENT_TYPES.get(content_type.split(";", 1)[0].strip().lower())
+
+def _records(body: str, catalog_format: str) -> Iterator[Tuple[int, object]]:
+    # (row, record): the line number for NDJSON and CSV, the position in the array for JSON
+    if catalog_format == "json":
+        try:
+            records = json.loads(body)
+        except ValueError as exc:
+            raise CatalogError([{"row": None, "id": None, "errors": [f"Invalid JSON: {exc}"]}])
+        if not isinstance(records, list):
+            raise CatalogError([{"row": None, "id": None, "errors": ["Expected a JSON array of menu items"]}])
+        yield from enumerate(records, start=1)
+    elif catalog_format == "ndjson":
+        for number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as exc:
+                yield number, exc
+    else:
+        reader = csv.DictReader(io.StringIO(body))
+        for record in reader:
+            # Empty cells are missing values (a required field then fails validation)
+            yield reader.line_num, {key: value or None for key, value in record.items() if key is not None}
+
+def parse_catalog(body: bytes, catalog_format: str) -> List[menu_schemas.MenuItemCreate]:
+    """Validates every row; raises CatalogError listing the invalid ones."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise CatalogError([{"row": None, "id": None, "errors": ["The catalog is not UTF-8 text"]}])
+    items: List[menu_schemas.MenuItemCreate] = []
+    errors: List[dict] = []
+    rows_by_id: Dict[str, int] = {}
+    for row, record in _records(text, catalog_format):
+        if isinstance(record, ValueError):
+            errors.append({"row": row, "id": None, "errors": [f"Invalid JSON: {record}"]})
+            continue
+        record_id = record.get("id") if isinstance(record, dict) else None
+        try:
+            item = menu_schemas.MenuItemCreate.model_validate(record)
+        except ValidationError as exc:
+            messages = [
+                f"{'.'.join(map(str, error['loc'])) or 'item'}: {error['msg']}" for error in exc.errors()
+            ]
+            errors.append({"row": row, "id": record_id, "errors": messages})
+            continue
+        if item.id in rows_by_id:
+            errors.append({"row": row, "id": item.id, "errors": [f"Duplicate id (first on row {rows_by_id[item.id]})"]})
+            continue
+        rows_by_id[item.id] = row
+        items.append(item)
+    if not items and not errors:
+        errors.append({"row": None, "id": None, "errors": ["The catalog is empty"]})
+    if errors:
+        raise CatalogError(errors)
+    return items
+
+@dataclass
+class CatalogDiff:
+    created: List[dict] = field(default_factory=list) # Rows to insert
+    updated: List[dict] = field(default_factory=list) # Full rows of the items that changed
+    deleted: List[str] = field(default_factory=list) # Ids
+    kept: List[str] = field(default_factory=list) # Ids to delete that order lines still reference
+    unchanged: int = 0
+
+def diff_catalog(
+    existing: Iterable[models.MenuItem], items: List[menu_schemas.MenuItemCreate], replace: bool
+) -> CatalogDiff:
+    """`existing`: the current rows of the catalog's ids (every row, if `replace`)."""
+    current = {menu_item.id: menu_item for menu_item in existing}
+    diff = CatalogDiff()
+    for item in items:
+        row = item.model_dump(include={"id", *IMPORTED_FIELDS})
+        menu_item = current.get(item.id)
+        if menu_item is None:
+            diff.created.append(row)
+        elif any(getattr(menu_item, name) != row[name] for name in IMPORTED_FIELDS):
+            diff.updated.append(row)
+        else:
+            diff.unchanged += 1
+    if replace:
+        imported = {item.id for item in items}
+        diff.deleted = sorted(menu_item_id for menu_item_id in current if menu_item_id not in imported)
+    return diff
+
+def upsert_statement(dialect_name: str):
+    """INSERT ... ON CONFLICT (id) DO UPDATE of the imported fields, or None on other dialects."""
+    upsert_insert = _UPSERT_INSERTS.get(dialect_name)
+    if upsert_insert is None:
+        return None
+    stmt = upsert_insert(models.MenuItem.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"], set_={name: stmt.excluded[name] for name in IMPORTED_FIELDS}
+    )
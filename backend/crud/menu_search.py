@@ -0,0 +1,73 @@
+# backend/crud/menu_search.py
+# In-memory inverted index for menu search.
+# Built from a catalog snapshot (see menu_cache.py), so searching never touches the
+# database and the index is rebuilt whenever the catalog is reloaded.
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+from schemas import menu as menu_schemas
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Matches in the name count more than matches in the category or the description
+FIELD_WEIGHTS = (("name", 3.0), ("category", 2.0), ("description", 1.0))
+# An indexed term that only starts with the query token ("marg" -> "marguerita")
+# scores less than an exact term match
+PREFIX_MATCH_FACTOR = 0.5
+
+def normalize(text: str) -> str:
+    # Case- and accent-insensitive form: "Água" -> "agua", "manjericão" -> "manjericao"
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text)) if text else []
+
+
+class MenuSearchIndex:
+    def __init__(self, items: Sequence[menu_schemas.MenuItem]):
+        # term -> {item id: field-weighted term frequency}
+        postings: Dict[str, Dict[str, float]] = {}
+        for item in items:
+            for field, weight in FIELD_WEIGHTS:
+                for term in tokenize(getattr(item, field)):
+                    item_weights = postings.setdefault(term, {})
+                    item_weights[item.id] = item_weights.get(item.id, 0.0) + weight
+        self._postings = postings
+        self._terms = sorted(postings) # For prefix lookups with bisect
+        self._idf = {term: math.log(1 + len(items) / len(ids)) for term, ids in postings.items()}
+        self._items = {item.id: item for item in items}
+
+    def _match_token(self, token: str) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        start = bisect.bisect_left(self._terms, token)
+        for term in self._terms[start:]:
+            if not term.startswith(token):
+                break
+            factor = self._idf[term] * (1.0 if term == token else PREFIX_MATCH_FACTOR)
+            for item_id, weight in self._postings[term].items():
+                # Several terms may share the prefix; an item scores by its best one
+                scores[item_id] = max(scores.get(item_id, 0.0), weight * factor)
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[menu_schemas.MenuItem]:
+        """Items matching every token of the query, best match first (the top `limit` only, if given)."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        scores = self._match_token(tokens[0])
+        for token in tokens[1:]:
+            if not scores:
+                break
+            token_scores = self._match_token(token)
+            scores = {item_id: score + token_scores[item_id] for item_id, score in scores.items() if item_id in token_scores}
+        rank = lambda item_id: (-scores[item_id], item_id)
+        if limit is not None and limit < len(scores):
+            ranked = heapq.nsmallest(limit, scores, key=rank)
+        else:
+            ranked = sorted(scores, key=rank)
+        return [self._items[item_id] for item_id in ranked]
@@ -0,0 +1,123 @@
+# backend/crud/menu_suggest.py
+# Prefix index (trie) for search-box suggestions.
+# Keys are the normalized item names, each word of a name and the categories, so
+# "marg" suggests "Pizza Marguerita". The trie lives as long as the process and
+# MenuCatalogCache syncs it with each reloaded catalog, touching only the items
+# that were added, changed or removed.
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from schemas import menu as menu_schemas
+from .menu_search import normalize, tokenize
+
+# (kind, key, display text): ("item", menu item id, name) or ("category", category, category)
+Entry = Tuple[str, str, str]
+
+
+class _Node:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.entries: Set[Entry] = set()
+
+
+def _keys(text: str) -> Set[str]:
+    # The whole text plus each of its words
+    keys = {normalize(text).strip()}
+    keys.update(tokenize(text))
+    keys.discard("")
+    return keys
+
+
+class MenuSuggestIndex:
+    def __init__(self):
+        self._root = _Node()
+        self._lock = threading.Lock()
+        self._items: Dict[str, Tuple[str, str]] = {} # id -> (name, category) currently indexed
+        self._category_items: Dict[str, int] = {} # A category stays suggested while it has items
+        self._suggestions: Dict[Entry, menu_schemas.MenuSuggestion] = {} # Built once per entry
+
+    def _insert(self, key: str, entry: Entry) -> None:
+        if entry not in self._suggestions:
+            kind, entry_key, text = entry
+            self._suggestions[entry] = menu_schemas.MenuSuggestion(
+                text=text, kind=kind, id=entry_key if kind == "item" else None
+            )
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+        node.entries.add(entry)
+
+    def _remove(self, key: str, entry: Entry) -> None:
+        path = [self._root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].entries.discard(entry)
+        # Prune the branch back up to the first node that is still in use
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.entries or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+
+    def _add_item(self, item_id: str, name: str, category: str) -> None:
+        self._items[item_id] = (name, category)
+        for key in _keys(name):
+            self._insert(key, ("item", item_id, name))
+        if category:
+            self._category_items[category] = self._category_items.get(category, 0) + 1
+            if self._category_items[category] == 1:
+                for key in _keys(category):
+                    self._insert(key, ("category", category, category))
+
+    def _drop_item(self, item_id: str) -> None:
+        name, category = self._items.pop(item_id)
+        for key in _keys(name):
+            self._remove(key, ("item", item_id, name))
+        self._suggestions.pop(("item", item_id, name), None)
+        if category:
+            self._category_items[category] -= 1
+            if not self._category_items[category]:
+                del self._category_items[category]
+                for key in _keys(category):
+                    self._remove(key, ("category", category, category))
+                self._suggestions.pop(("category", category, category), None)
+
+    def sync(self, items: Iterable[menu_schemas.MenuItem]) -> None:
+        """Bring the index in line with the catalog, re-indexing only what differs."""
+        wanted = {item.id: (item.name, item.category) for item in items}
+        with self._lock:
+            for item_id in [item_id for item_id in self._items if wanted.get(item_id) != self._items[item_id]]:
+                self._drop_item(item_id)
+            for item_id, (name, category) in wanted.items():
+                if item_id not in self._items:
+                    self._add_item(item_id, name, category)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[menu_schemas.MenuSuggestion]:
+        """Entries whose keys start with `prefix`, shortest completions first."""
+        prefix = normalize(prefix).strip()
+        if not prefix or limit <= 0:
+            return []
+        suggestions: List[menu_schemas.MenuSuggestion] = []
+        seen: Set[Entry] = set()
+        with self._lock:
+            node: Optional[_Node] = self._root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            queue = deque([node])
+            while queue and len(suggestions) < limit:
+                node = queue.popleft()
+                for entry in sorted(node.entries - seen, key=lambda entry: (entry[0] != "category", entry[2])):
+                    seen.add(entry)
+                    suggestions.append(self._suggestions[entry])
+                    if len(suggestions) == limit:
+                        break
+                queue.extend(node.children[char] for char in sorted(node.children))
+        return suggestions
@@ -0,0 +1,173 @@
+# backend/crud/order_batcher.py
+# Group commit for order inserts.
+# With ORDER_BATCH_ENABLED, create-order requests hand their order to a single
+# writer thread instead of committing on their own. The writer collects whatever
+# arrives within a short window (up to a maximum batch size), validates the whole
+# batch with one menu lookup and commits it in one transaction, so concurrent
+# orders share one fsync and one turn on the database write lock.
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import database, models
+from schemas import order as order_schemas
+from . import crud_analytics, crud_menu, crud_order
+from .recommendations import recommender
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingOrder:
+    order: order_schemas.OrderCreate
+    user_id: int
+    future: Future = field(default_factory=Future)
+
+
+class OrderBatcher:
+    def __init__(self, session_factory: Callable[[], Session], max_batch_size: int, max_wait_seconds: float):
+        self._session_factory = session_factory
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: "queue.Queue[Optional[_PendingOrder]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.orders = 0
+        self.fallbacks = 0 # Batches whose commit failed and were retried order by order
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="order-batcher", daemon=True)
+                    self._thread.start()
+
+    def _enqueue(self, order: order_schemas.OrderCreate, user_id: int) -> Future:
+        self._ensure_worker()
+        pending = _PendingOrder(order=order, user_id=user_id)
+        self._queue.put(pending)
+        return pending.future
+
+    def submit(self, order: order_schemas.OrderCreate, user_id: int) -> order_schemas.Order:
+        """Queue an order and wait for its batch to commit. Raises ValueError like crud_order.create_order."""
+        return self._enqueue(order, user_id).result()
+
+    async def asubmit(self, order: order_schemas.OrderCreate, user_id: int) -> order_schemas.Order:
+        return await asyncio.wrap_future(self._enqueue(order, user_id))
+
+    def close(self) -> None:
+        # Commit what is already queued, then stop the writer
+        thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"batches": self.batches, "orders": self.orders, "fallbacks": self.fallbacks}
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                batch.append(pending)
+            try:
+                self._commit_batch(batch)
+            except Exception as e: # Never let the writer die with callers waiting
+                logger.exception("Order batch failed")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+            if stopping:
+                return
+
+    def _commit_batch(self, batch: List[_PendingOrder]) -> None:
+        db = self._session_factory()
+        try:
+            menu_item_ids = {item_in.menu_item_id for pending in batch for item_in in pending.order.items}
+            menu_items = crud_menu.get_menu_items_by_ids(db, menu_item_ids)
+            # An invalid order only fails its own caller
+            accepted = []
+            for pending in batch:
+                try:
+                    db_order = crud_order.build_order(pending.order, pending.user_id, menu_items)
+                except ValueError as e:
+                    pending.future.set_exception(e)
+                    continue
+                accepted.append((pending, db_order))
+            if not accepted:
+                return
+            try:
+                db_orders = [db_order for _, db_order in accepted]
+                db.add_all(db_orders)
+                crud_analytics.record_orders(db, db_orders) # One upsert per rollup for the batch
+                db.flush()
+                # Snapshot after the flush (ids are assigned) and before the commit
+                # expires the instances, so building the responses needs no extra queries
+                results = [order_schemas.Order.model_validate(db_order) for _, db_order in accepted]
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.warning("Order batch of %d failed to commit; retrying order by order", len(accepted), exc_info=True)
+                with self._stats_lock:
+                    self.fallbacks += 1
+                self._commit_one_by_one(db, [pending for pending, _ in accepted], menu_items)
+                return
+            for (pending, _), result in zip(accepted, results):
+                recommender.record_order(result.id, [item.menu_item_id for item in result.items])
+                pending.future.set_result(result)
+            with self._stats_lock:
+                self.batches += 1
+                self.orders += len(accepted)
+        finally:
+            db.close()
+
+    def _commit_one_by_one(self, db: Session, batch: List[_PendingOrder], menu_items: Dict[str, models.MenuItem]) -> None:
+        # The rolled-back instances are discarded; each order is rebuilt and committed alone
+        for pending in batch:
+            try:
+                db_order = crud_order.build_order(pending.order, pending.user_id, menu_items)
+                db.add(db_order)
+                crud_analytics.record_orders(db, [db_order])
+                db.flush()
+                result = order_schemas.Order.model_validate(db_order)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                pending.future.set_exception(e)
+                continue
+            recommender.record_order(result.id, [item.menu_item_id for item in result.items])
+            pending.future.set_result(result)
+            with self._stats_lock:
+                self.orders += 1
+
+
+order_batcher = OrderBatcher(
+    database.SessionLocal,
+    max_batch_size=settings.ORDER_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.ORDER_BATCH_MAX_WAIT_MS / 1000,
+)
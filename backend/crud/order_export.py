@@ -0,0 +1,129 @@
+# backend/crud/order_export.py
+# Streaming export of orders as NDJSON (one order per line, shaped like the Order
+# schema) or CSV (one row per order line). Rows are read as plain tuples through a
+# server-side cursor (yield_per) and written out in chunks, so memory stays flat
+# whatever the size of the export. The generators open their own session: a
+# StreamingResponse keeps iterating after the request's dependencies have exited.
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import AsyncIterator, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import select
+
+from core import money
+from database import database, models
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = (
+    "order_id", "user_id", "total_price", "order_item_id", "menu_item_id", "quantity", "unit_price", "name", "line_total",
+)
+
+YIELD_PER = 1000 # Rows fetched from the cursor at a time
+CHUNK_SIZE = 64 * 1024 # Bytes per chunk handed to the response
+
+# Same order as CSV_COLUMNS, without line_total (computed like order_schemas.OrderItem.line_total)
+Row = Tuple[int, int, Decimal, Optional[int], Optional[str], Optional[int], Optional[Decimal], Optional[str]]
+
+def _json_amount(amount: Optional[Decimal]) -> Optional[float]:
+    # Amounts are JSON numbers, as in the API responses (CSV keeps both decimal places)
+    return None if amount is None else float(amount)
+
+def export_statement(min_id: Optional[int] = None, max_id: Optional[int] = None):
+    stmt = (
+        select(
+            models.Order.id, models.Order.user_id, models.Order.total_price,
+            models.OrderItem.id, models.OrderItem.menu_item_id, models.OrderItem.quantity,
+            models.OrderItem.unit_price, models.OrderItem.name,
+        )
+        .outerjoin(models.OrderItem, models.OrderItem.order_id == models.Order.id)
+        .order_by(models.Order.id, models.OrderItem.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    if min_id is not None:
+        stmt = stmt.where(models.Order.id >= min_id)
+    if max_id is not None:
+        stmt = stmt.where(models.Order.id <= max_id)
+    return stmt
+
+class _Encoder:
+    """Turns rows into lines of the chosen format, holding at most one order at a time."""
+
+    def __init__(self, export_format: str):
+        self.export_format = export_format
+        self._order: Optional[dict] = None
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+
+    def header(self) -> str:
+        if self.export_format == "csv":
+            self._csv.writerow(CSV_COLUMNS)
+        return self._take()
+
+    def _take(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def _flush_order(self) -> None:
+        if self._order is not None:
+            self._buffer.write(json.dumps(self._order, separators=(",", ":")))
+            self._buffer.write("\n")
+            self._order = None
+
+    def feed(self, rows: Iterable[Row]) -> str:
+        for order_id, user_id, total_price, item_id, menu_item_id, quantity, unit_price, name in rows:
+            if self.export_format == "csv":
+                self._csv.writerow((
+                    order_id, user_id, total_price, item_id, menu_item_id, quantity,
+                    unit_price, name, money.line_total(unit_price, quantity),
+                ))
+                continue
+            # Rows arrive grouped by order: an order is complete when the next one starts
+            if self._order is None or self._order["id"] != order_id:
+                self._flush_order()
+                self._order = {"id": order_id, "user_id": user_id, "total_price": _json_amount(total_price), "items": []}
+            if item_id is not None:
+                self._order["items"].append({
+                    "menu_item_id": menu_item_id, "quantity": quantity, "id": item_id,
+                    "unit_price": _json_amount(unit_price), "name": name,
+                    "line_total": _json_amount(money.line_total(unit_price, quantity)),
+                })
+        return self._take()
+
+    def finish(self) -> str:
+        self._flush_order()
+        return self._take()
+
+def stream_orders(export_format: str, min_id: Optional[int] = None, max_id: Optional[int] = None) -> Iterator[bytes]:
+    encoder = _Encoder(export_format)
+    pending = encoder.header()
+    db = database.SessionLocal()
+    try:
+        result = db.execute(export_statement(min_id, max_id))
+        for rows in result.partitions():
+            pending += encoder.feed(rows)
+            if len(pending) >= CHUNK_SIZE:
+                yield pending.encode()
+                pending = ""
+    finally:
+        db.close()
+    pending += encoder.finish()
+    if pending:
+        yield pending.encode()
+
+async def astream_orders(export_format: str, min_id: Optional[int] = None, max_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    encoder = _Encoder(export_format)
+    pending = encoder.header()
+    async with database.AsyncSessionLocal() as db:
+        result = await db.stream(export_statement(min_id, max_id))
+        async for rows in result.partitions():
+            pending += encoder.feed(rows)
+            if len(pending) >= CHUNK_SIZE:
+                yield pending.encode()
+                pending = ""
+    pending += encoder.finish()
+    if pending:
+        yield pending.encode()
@@ -0,0 +1,317 @@
+# backend/crud/recommendations.py
+# "Frequently bought together" suggestions for the cart.
+# Keeps a sparse item-by-item co-occurrence matrix C, where C[i, j] is the number of
+# orders containing both menu items i and j, built with sparse products from the
+# order history (C = Bᵀ·B over the order-by-item incidence matrix B). New orders
+# are buffered and merged into C incrementally, at most every
+# RECOMMENDATIONS_REFRESH_SECONDS, so serving a cart is a sparse row sum plus a sort
+# over the menu.
+#
+# Orders reach the matrix three ways: the build (every order line in the database),
+# record_order (orders committed by this process) and, on each refresh, a catch-up
+# query for order ids above the highest one read so far (orders placed through other
+# worker processes). The same order can come through more than one of them, and in
+# any id order, so every merge skips the orders already counted: the ids the build
+# read (a sorted array) and those merged since. An order committed by another worker
+# with a lower id than one already caught up is only counted by the next full
+# rebuild, every RECOMMENDATIONS_REBUILD_SECONDS.
+#
+# The build reads every order line, so it runs in a background thread with its own
+# session (never on the request path, which in async mode is the event loop): the
+# first one starts with the app, rebuilds when a request finds the matrix too old.
+# Requests keep being served from the previous matrix, or get no suggestions before
+# the first build, until the new one is swapped in.
+import logging
+import threading
+import time
+from typing import Callable, Container, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import database, models
+
+YIELD_PER = 10000 # order_items rows read at a time when building from the database
+
+logger = logging.getLogger(__name__)
+
+def cooccurrence(order_codes: np.ndarray, item_codes: np.ndarray, n_items: int) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Co-occurrence matrix (zero diagonal) and per-item order counts from
+    parallel arrays of (order index, item index) pairs.
+    """
+    n_orders = int(order_codes.max()) + 1 if len(order_codes) else 0
+    baskets = sparse.csr_matrix(
+        (np.ones(len(item_codes), dtype=np.int32), (order_codes, item_codes)), shape=(n_orders, n_items)
+    )
+    baskets.data[:] = 1 # An item counts once per order, even if it appears on several lines
+    counts = (baskets.T @ baskets).tocsr()
+    popularity = counts.diagonal().astype(np.int64)
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return counts, popularity
+
+def _encode(item_ids: Iterable[str], index: Dict[str, int], ids: List[str]) -> List[int]:
+    # Rows of the items, assigning new ones to items seen for the first time
+    codes = []
+    for item_id in item_ids:
+        code = index.get(item_id)
+        if code is None:
+            code = index[item_id] = len(ids)
+            ids.append(item_id)
+        codes.append(code)
+    return codes
+
+class CoOccurrenceRecommender:
+    def __init__(
+        self, refresh_seconds: float = 0, rebuild_seconds: float = 0,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds # 0: never rebuild once loaded
+        self._session_factory = session_factory # For the background builds; None: only build() and load()
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {} # menu item id -> row/column
+        self._ids: List[str] = []
+        self._counts = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self._popularity = np.zeros(0, dtype=np.int64)
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._building = False
+        self._build_started_at = float("-inf")
+        self._catching_up = False
+        self._loaded_ids = np.zeros(0, dtype=np.int64) # Order ids read by the build, sorted
+        self._merged_ids: Set[int] = set() # Order ids merged since the build
+        self._caught_up_to = 0 # Highest order id read from the database
+        self._caught_up_at = 0.0
+        self._pending: List[Tuple[int, Tuple[str, ...]]] = [] # (order id, item ids) not merged yet
+        self._pending_since = 0.0
+
+    def _codes(self, item_ids: Iterable[str]) -> List[int]:
+        # Called with the lock held
+        return _encode(item_ids, self._index, self._ids)
+
+    def _add(self, order_codes: np.ndarray, item_codes: np.ndarray) -> None:
+        # Builds new arrays instead of updating in place: recommend() reads the
+        # current ones outside the lock
+        n = len(self._ids)
+        counts, popularity = cooccurrence(order_codes, item_codes, n)
+        previous = self._counts.tocoo()
+        previous = sparse.csr_matrix((previous.data, (previous.row, previous.col)), shape=(n, n))
+        previous_popularity = np.zeros(n, dtype=np.int64)
+        previous_popularity[:len(self._popularity)] = self._popularity
+        self._counts = (previous + counts).tocsr()
+        self._popularity = previous_popularity + popularity
+
+    def load(self, order_ids: Sequence[int], item_ids: Sequence[str]) -> None:
+        """Replace the matrix with one built from (order id, menu item id) pairs."""
+        # Computed outside the lock, so recommend() keeps serving the previous matrix
+        index: Dict[str, int] = {}
+        ids: List[str] = []
+        item_codes = np.asarray(_encode(item_ids, index, ids), dtype=np.int64)
+        loaded_ids, order_codes = np.unique(np.asarray(order_ids, dtype=np.int64), return_inverse=True)
+        counts, popularity = cooccurrence(order_codes, item_codes, len(ids))
+        with self._lock:
+            self._index, self._ids = index, ids
+            self._counts, self._popularity = counts, popularity
+            self._loaded_ids = loaded_ids
+            self._merged_ids = set()
+            self._caught_up_to = int(self._loaded_ids[-1]) if len(self._loaded_ids) else 0
+            self._loaded = True
+            self._loaded_at = self._caught_up_at = time.monotonic()
+            # Orders recorded while the build was reading: merge those it did not see
+            self._merge_pending()
+
+    def _claim_build(self, rebuild: bool) -> bool:
+        with self._lock:
+            if (self._loaded and not rebuild) or self._building:
+                return False
+            self._building = True # From here on, record_order buffers new orders and refresh waits
+            self._build_started_at = time.monotonic()
+            return True
+
+    def _release_build(self) -> None:
+        with self._lock:
+            self._building = False
+
+    def _read_and_load(self, db: Session) -> None:
+        result = db.execute(
+            select(models.OrderItem.order_id, models.OrderItem.menu_item_id).execution_options(yield_per=YIELD_PER)
+        )
+        order_ids: List[int] = []
+        item_ids: List[str] = []
+        for rows in result.partitions():
+            for order_id, menu_item_id in rows:
+                order_ids.append(order_id)
+                item_ids.append(menu_item_id)
+        self.load(order_ids, item_ids)
+
+    def build(self, db: Session, rebuild: bool = False) -> None:
+        """Build from every order line in the database, in the calling thread."""
+        if not self._claim_build(rebuild):
+            return
+        try:
+            self._read_and_load(db)
+        finally:
+            self._release_build()
+
+    def start_build(self, rebuild: bool = False) -> None:
+        """build() in a background thread, with a session of its own."""
+        if self._session_factory is None or not self._claim_build(rebuild):
+            return
+        thread = threading.Thread(target=self._build_in_background, name="recommendations-build", daemon=True)
+        try:
+            thread.start()
+        except BaseException:
+            self._release_build()
+            raise
+
+    def _build_in_background(self) -> None:
+        try:
+            with self._session_factory() as db:
+                self._read_and_load(db)
+        except Exception:
+            # The previous matrix stays; the next request retries after refresh_seconds
+            logger.exception("Building the recommendations matrix failed")
+        finally:
+            self._release_build()
+
+    def _build_due(self) -> Optional[bool]:
+        # None, or whether the due build is a rebuild
+        now = time.monotonic()
+        with self._lock:
+            if self._building or now - self._build_started_at < self.refresh_seconds:
+                return None # Running, or failed a moment ago
+            if not self._loaded:
+                return False
+            if self.rebuild_seconds and now - self._loaded_at >= self.rebuild_seconds:
+                return True
+            return None
+        self._build_started_at = float("-inf")
+
+    def record_order(self, order_id: int, item_ids: Iterable[str]) -> None:
+        """Buffer a committed order; it is merged on the next refresh."""
+        with self._lock:
+            if not (self._loaded or self._building):
+                return # The first build reads it from the database
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((order_id, tuple(item_ids)))
+
+    def _counted(self, order_id: int) -> bool:
+        # Called with the lock held
+        if order_id in self._merged_ids:
+            return True
+        position = int(np.searchsorted(self._loaded_ids, order_id))
+        return position < len(self._loaded_ids) and self._loaded_ids[position] == order_id
+
+    def _merge(self, orders: Iterable[Tuple[int, Sequence[str]]]) -> None:
+        # Called with the lock held; skips the orders already in the matrix
+        new = []
+        for order_id, item_ids in orders:
+            if not self._counted(order_id):
+                self._merged_ids.add(order_id)
+                new.append(item_ids)
+        if not new:
+            return
+        order_codes = np.repeat(np.arange(len(new)), [len(item_ids) for item_ids in new])
+        item_codes = np.asarray(self._codes(item_id for item_ids in new for item_id in item_ids), dtype=np.int64)
+        self._add(order_codes, item_codes)
+
+    def _merge_pending(self) -> None:
+        # Called with the lock held
+        pending, self._pending = self._pending, []
+        self._merge(pending)
+
+    def _catch_up(self, db: Session) -> None:
+        # Orders above the highest id read so far, e.g. placed through other workers
+        with self._lock:
+            if self._catching_up or self._building:
+                return
+            self._catching_up = True
+            after = self._caught_up_to
+        try:
+            rows = db.execute(
+                select(models.OrderItem.order_id, models.OrderItem.menu_item_id)
+                .where(models.OrderItem.order_id > after)
+                .order_by(models.OrderItem.order_id)
+            ).all()
+            orders: Dict[int, List[str]] = {}
+            for order_id, menu_item_id in rows:
+                orders.setdefault(order_id, []).append(menu_item_id)
+            with self._lock:
+                if self._caught_up_to == after: # Not replaced by a rebuild meanwhile
+                    self._merge(orders.items())
+                    self._caught_up_to = max(orders, default=after)
+                self._caught_up_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._catching_up = False
+
+    def refresh(self, db: Optional[Session] = None, force: bool = False) -> None:
+        """
+        Merge the buffered orders (and, given a session, the ones committed through
+        other processes) if RECOMMENDATIONS_REFRESH_SECONDS have passed, or `force`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._building:
+                return # The build merges the buffer when it is done
+            if self._pending and (force or now - self._pending_since >= self.refresh_seconds):
+                self._merge_pending()
+            catch_up = db is not None and self._loaded and (force or now - self._caught_up_at >= self.refresh_seconds)
+        if catch_up:
+            self._catch_up(db)
+
+    def recommend(
+        self, db: Session, cart: Sequence[str], limit: int = 5, allowed: Optional[Container[str]] = None
+    ) -> List[str]:
+        """
+        Menu item ids most often bought with the cart, best first. Ties, and carts with
+        no history, fall back to overall popularity. `allowed`, if given, restricts
+        the candidates (e.g. to items on the menu, of a category). Empty until the
+        first build has finished.
+        """
+        if db is not None:
+            rebuild = self._build_due()
+            if rebuild is not None:
+                self.start_build(rebuild=rebuild) # Returns at once; this call uses the current matrix
+        self.refresh(db)
+        with self._lock:
+            counts, popularity, ids, index = self._counts, self._popularity, self._ids, self._index
+        if not ids:
+            return []
+        # Items indexed after these arrays were built have no row in them yet
+        rows = [index[item_id] for item_id in set(cart) if index.get(item_id, len(popularity)) < len(popularity)]
+        scores = popularity / (popularity.max() + 1.0) # < 1: only breaks ties between co-occurrence counts
+        if rows:
+            scores = scores + np.asarray(counts[rows].sum(axis=0)).ravel()
+        in_cart = set(cart)
+        recommended = []
+        for code in np.argsort(-scores, kind="stable"):
+            item_id = ids[code]
+            if item_id in in_cart or (allowed is not None and item_id not in allowed):
+                continue
+            recommended.append(item_id)
+            if len(recommended) == limit:
+                break
+        return recommended
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "items": len(self._ids),
+                "pairs": int(self._counts.nnz),
+                "pending_orders": len(self._pending),
+                "orders_merged_since_build": len(self._merged_ids),
+                "caught_up_to_order_id": self._caught_up_to,
+            }
+
+
+recommender = CoOccurrenceRecommender(
+    refresh_seconds=settings.RECOMMENDATIONS_REFRESH_SECONDS, rebuild_seconds=settings.RECOMMENDATIONS_REBUILD_SECONDS,
+    session_factory=database.SessionLocal,
+)
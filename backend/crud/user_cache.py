@@ -0,0 +1,103 @@
+# backend/crud/user_cache.py
+# Short-lived cache of access token -> authenticated user snapshot, so that
+# deps.get_current_user does not decode the JWT and query the user on every request.
+# crud_user invalidates a user's entries whenever the user is updated, deleted or
+# changes password, so a deactivated user is rejected on the very next request
+# served by this process; the TTL bounds staleness for changes made elsewhere.
+#
+# A request can read a user from the database just before the user is changed and
+# put() the old snapshot just after the invalidation. To rule that out, callers read
+# generation() before their lookup and pass it to put(): invalidate_user records the
+# generation at which each user last changed, and snapshots read before it (with a
+# lower generation) are not cached.
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from core.config import settings
+from schemas import user as user_schemas
+
+
+class AuthenticatedUserCache:
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Keyed by a digest so raw bearer tokens are not kept in memory; LRU order
+        self._entries: "OrderedDict[bytes, Tuple[float, user_schemas.User]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[bytes]] = {}
+        self._generation = 0 # Bumped by every invalidation
+        self._invalidated_at: Dict[int, int] = {} # user id -> generation of its last invalidation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _discard(self, key: bytes) -> None:
+        _, user = self._entries.pop(key)
+        keys = self._keys_by_user.get(user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user.id]
+
+    def get(self, token: str) -> Optional[user_schemas.User]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._discard(key)
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def generation(self) -> int:
+        """Read before loading the user that will be passed to put()."""
+        with self._lock:
+            return self._generation
+
+    def put(
+        self, token: str, user: user_schemas.User, generation: int, token_expires_at: Optional[float] = None
+    ) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at) # Never outlive the token itself
+        key = self._key(token)
+        with self._lock:
+            if self._invalidated_at.get(user.id, -1) > generation:
+                return # Changed since the caller read it
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (expires_at, user)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at[user_id] = self._generation
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._discard(key)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self._entries)}
+
+
+auth_user_cache = AuthenticatedUserCache(
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS, max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES
+)
@@ -1,17 +1,91 @@
 # backend/database/database.py
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session as SQLAlchemySession # Renamed to avoid conflict
-from typing import Generator
+from typing import Any, Dict, Generator, List
 
+from core import metrics, query_stats
 from core.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False} # Required for SQLite
-)
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+class _TimedCheckout:
+    # Records how long each checkout waits for a connection (metrics.DB_POOL_CHECKOUT_WAIT):
+    # time spent here grows when POOL_SIZE + MAX_OVERFLOW is too small for the load
+    engine_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, self.engine_label)
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """create_engine() keyword arguments for `url`, from the DB_POOL_* settings."""
+    parsed = make_url(url)
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False} # Connections move between request threads
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection: no pool to size
+            return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if parsed.get_dialect().is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+def sqlite_pragmas() -> List[str]:
+    pragmas = []
+    if settings.SQLITE_BUSY_TIMEOUT_MS:
+        # First, so that switching the journal mode also waits for a busy database
+        pragmas.append(f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}")
+    if settings.SQLITE_JOURNAL_MODE:
+        pragmas.append(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    if settings.SQLITE_SYNCHRONOUS:
+        pragmas.append(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    if settings.SQLITE_MMAP_SIZE:
+        pragmas.append(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}")
+    if settings.SQLITE_CACHE_SIZE:
+        pragmas.append(f"PRAGMA cache_size = {settings.SQLITE_CACHE_SIZE}")
+    return pragmas
+
+def apply_sqlite_pragmas(engine: Engine) -> None:
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+if _is_sqlite(SQLALCHEMY_DATABASE_URL):
+    apply_sqlite_pragmas(engine)
+if settings.SQL_QUERY_STATS_ENABLED:
+    query_stats.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -23,3 +97,31 @@ def get_db() -> Generator[SQLAlchemySession, None, None]:
         yield db
     finally:
         db.close()
+
+# --- Async engine (only created when DATABASE_ASYNC_MODE is on) ---
+
+# Async drivers for the sync URLs we use
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name() # "postgresql" for postgresql+psycopg2:// too
+    if backend in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    return parsed.render_as_string(hide_password=False)
+
+SQLALCHEMY_ASYNC_DATABASE_URL = settings.SQLALCHEMY_ASYNC_DATABASE_URL or async_database_url(SQLALCHEMY_DATABASE_URL)
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC_MODE:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, **engine_options(SQLALCHEMY_ASYNC_DATABASE_URL))
+    if _is_sqlite(SQLALCHEMY_ASYNC_DATABASE_URL):
+        apply_sqlite_pragmas(async_engine.sync_engine)
+    if settings.SQL_QUERY_STATS_ENABLED:
+        query_stats.install(async_engine.sync_engine)
+    # expire_on_commit=False: touching an expired attribute outside the session's
+    # greenlet would need implicit IO, which AsyncSession cannot do
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
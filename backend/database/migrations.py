@@ -0,0 +1,121 @@
+# backend/database/migrations.py
+# Minimal schema migrations for databases created before a model change.
+# create_all() creates missing tables but never alters existing ones, so each step
+# below brings an older database up to date. Applied versions are recorded in the
+# schema_migrations table; steps must be safe on a database created by the current
+# models (where there is nothing to do).
+# This would be Alembic's job in a production setup.
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+def _has_column(connection: Connection, table: str, column: str) -> bool:
+    return any(existing["name"] == column for existing in inspect(connection).get_columns(table))
+
+def _add_order_created_at(connection: Connection) -> None:
+    if _has_column(connection, "orders", "created_at"):
+        return
+    connection.execute(text("ALTER TABLE orders ADD COLUMN created_at TIMESTAMP"))
+    # The real creation time of older orders is unknown: they count as of the migration
+    connection.execute(text("UPDATE orders SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+
+def _add_order_item_snapshots(connection: Connection) -> None:
+    for column, column_type in (("unit_price", "FLOAT"), ("name", "VARCHAR")):
+        if not _has_column(connection, "order_items", column):
+            connection.execute(text(f"ALTER TABLE order_items ADD COLUMN {column} {column_type}"))
+    from crud import crud_order # Imported here: crud modules import the database package
+    with Session(bind=connection) as db:
+        crud_order.backfill_order_item_snapshots(db)
+
+def _backfill_sales_rollups(connection: Connection) -> None:
+    from crud import crud_analytics # Imported here: crud modules import the database package
+    # order_items.unit_price and category only exist from migrations 3 and 6 on: before
+    # that, lines are priced and categorized from the current menu, as when this step was written
+    line_prices = _has_column(connection, "order_items", "unit_price")
+    line_categories = _has_column(connection, "order_items", "category")
+    with Session(bind=connection) as db:
+        crud_analytics.rebuild_rollups(db, line_prices=line_prices, line_categories=line_categories)
+        db.flush()
+
+# Amount columns that were FLOAT (dollars) before they became INTEGER cents (models.Cents)
+_MONEY_COLUMNS = (("menu_items", "price"), ("orders", "total_price"), ("order_items", "unit_price"))
+
+def _convert_amounts_to_cents(connection: Connection) -> None:
+    inspector = inspect(connection)
+    converted = False
+    for table, column in _MONEY_COLUMNS:
+        column_type = next(existing["type"] for existing in inspector.get_columns(table) if existing["name"] == column)
+        if isinstance(column_type, Integer):
+            continue # Created as cents
+        if connection.dialect.name == "sqlite":
+            # SQLite cannot change a column's type; the REAL column holds whole numbers of
+            # cents from now on, which models.Cents reads back exactly
+            connection.execute(text(f"UPDATE {table} SET {column} = ROUND({column} * 100)"))
+        else:
+            connection.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE INTEGER USING ROUND({column} * 100)"
+            ))
+        converted = True
+    if converted:
+        # The rollup tables may have been created either way; they are derived from
+        # the converted lines, so rebuild them rather than convert them (categorized
+        # from the current menu, as when this step was written, until migration 6)
+        from crud import crud_analytics
+        line_categories = _has_column(connection, "order_items", "category")
+        with Session(bind=connection) as db:
+            crud_analytics.rebuild_rollups(db, line_categories=line_categories)
+
+def _add_composite_indexes(connection: Connection) -> None:
+    for index in (
+        models.Order.__table__.indexes | models.OrderItem.__table__.indexes | models.MenuItem.__table__.indexes
+    ):
+        index.create(connection, checkfirst=True)
+
+def _add_order_item_category(connection: Connection) -> None:
+    if not _has_column(connection, "order_items", "category"):
+        connection.execute(text("ALTER TABLE order_items ADD COLUMN category VARCHAR"))
+    # The rollups already hold each line under the category it was ordered in; the
+    # current one is the closest guess for the lines themselves
+    from crud import crud_order
+    with Session(bind=connection) as db:
+        crud_order.backfill_order_item_categories(db)
+
+# (version, description, step); append new steps, never reorder or edit applied ones
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Add orders.created_at", _add_order_created_at),
+    (2, "Backfill sales rollups", _backfill_sales_rollups),
+    (3, "Add order_items.unit_price and order_items.name", _add_order_item_snapshots),
+    (4, "Store amounts as integer cents", _convert_amounts_to_cents),
+    (5, "Add orders(user_id, id), order_items(order_id) and menu_items(category, id) indexes", _add_composite_indexes),
+    (6, "Add order_items.category", _add_order_item_category),
+]
+
+def run_migrations(engine: Engine) -> None:
+    _metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migrations.c.version)).scalars())
+    for version, description, step in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info("Applying migration %d: %s", version, description)
+        with engine.begin() as connection:
+            step(connection)
+            connection.execute(
+                schema_migrations.insert().values(version=version, applied_at=datetime.now(timezone.utc))
+            )
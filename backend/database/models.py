@@ -1,8 +1,27 @@
 # backend/database/models.py
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, DateTime, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
+
+from core import money
 from .database import Base
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class Cents(TypeDecorator):
+    """Money column: an INTEGER number of cents, read and written as a Decimal amount (see core/money.py)."""
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else money.to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else money.from_cents(value)
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -16,24 +35,57 @@ class MenuItem(Base):
     id = Column(String, primary_key=True, index=True) # As per user specification (string ID)
     name = Column(String, index=True, nullable=False)
     description = Column(String)
-    price = Column(Float, nullable=False)
+    price = Column(Cents, nullable=False)
     category = Column(String, index=True)
     imageUrl = Column(String) # SQLAlchemy convention is often snake_case (e.g., image_url)
+    __table_args__ = (
+        Index("ix_menu_items_category_id", "category", "id"), # Category listing, in keyset (id) order
+    )
 
 class Order(Base):
     __tablename__ = "orders"
     id = Column(Integer, primary_key=True, index=True)
-    total_price = Column(Float, nullable=False)
+    total_price = Column(Cents, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=utcnow, nullable=False) # UTC
     owner = relationship("User", back_populates="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("ix_orders_user_id_id", "user_id", "id"), # A user's orders, newest first (keyset on id)
+    )
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     id = Column(Integer, primary_key=True, index=True)
     quantity = Column(Integer, nullable=False)
     menu_item_id = Column(String, ForeignKey("menu_items.id"), nullable=False)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    # Snapshot of the menu item when the order was placed, so reads need no join
+    # and later price, name or category changes do not rewrite past orders (nor the
+    # sales rollups rebuilt from them)
+    unit_price = Column(Cents)
+    name = Column(String)
+    category = Column(String)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True) # Loading an order's items
     order = relationship("Order", back_populates="items")
     # Optional: relationship to MenuItem for easier access from OrderItem if needed
     # menu_item = relationship("MenuItem")
+
+# --- Sales rollups (see crud/crud_analytics.py) ---
+# One row per UTC day and menu item / category, updated in the same transaction as
+# each order, so dashboard queries read a few rows per day instead of the order history.
+
+class SalesDailyItem(Base):
+    __tablename__ = "sales_daily_items"
+    day = Column(Date, primary_key=True)
+    menu_item_id = Column(String, primary_key=True) # No FK: rollups outlive deleted menu items
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Cents, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0) # Orders containing the item
+
+class SalesDailyCategory(Base):
+    __tablename__ = "sales_daily_categories"
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True) # The item's category when it was ordered
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Cents, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0) # Orders with at least one item in the category
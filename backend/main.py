@@ -1,18 +1,41 @@
 # backend/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from database import models, database
-from api.routes import auth, menu, orders
+from database import models, database, migrations
+from core import idempotency, metrics, pagination, profiling, query_stats, security
 from core.config import settings
+from crud.order_batcher import order_batcher
+from crud.recommendations import recommender
+
+from api.routes import analytics # Reporting stays sync in both modes
+from api.routes import metrics as metrics_routes
+from api.routes import profiles
+if settings.DATABASE_ASYNC_MODE:
+    from api.routes.aio import auth, menu, orders
+else:
+    from api.routes import auth, menu, orders
 
 # Create database tables if they don't exist
 # This should ideally be handled by Alembic migrations in a production setup
 models.Base.metadata.create_all(bind=database.engine)
+migrations.run_migrations(database.engine) # Brings databases created by older versions up to date
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the "frequently bought together" matrix in the background, before the first checkout
+    recommender.start_build()
+    yield
+    # Commit the orders still waiting for a batch before the process exits
+    order_batcher.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
+    lifespan=lifespan,
     openapi_url=f"/api/v1/openapi.json" # Standard OpenAPI doc location
 )
 
@@ -32,12 +55,38 @@ if settings.BACKEND_CORS_ORIGINS:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            # Let browser clients read the caching, pagination, idempotency and timing headers
+            expose_headers=[
+                "ETag", pagination.NEXT_CURSOR_HEADER, idempotency.IDEMPOTENT_REPLAYED_HEADER,
+                query_stats.SERVER_TIMING_HEADER, profiling.PROFILE_ID_HEADER,
+            ],
         )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+if settings.SQL_QUERY_STATS_ENABLED:
+    app.add_middleware(query_stats.QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware) # Outermost: its latency includes the other middleware
+
+# Password hashing is saturated: ask the client to come back instead of queueing unboundedly
+@app.exception_handler(security.PasswordHashingBusy)
+def password_hashing_busy_handler(request: Request, exc: security.PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many authentication requests, please retry shortly."},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(menu.router, prefix="/api/v1/menu", tags=["Menu"])
 app.include_router(orders.router, prefix="/api/v1/orders", tags=["Orders"])
+app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_routes.router, prefix="/api/v1/metrics", tags=["Health"])
+if settings.PROFILING_ENABLED:
+    app.include_router(profiles.router, prefix="/api/v1/admin/profiles", tags=["Admin"])
 
 @app.get("/api/v1")
 def read_root():
@@ -0,0 +1,61 @@
+# backend/maintenance.py
+# Data maintenance tasks, run by hand against the configured database:
+#
+#   python maintenance.py backfill-order-lines   # price/name/category snapshot of older order lines
+#   python maintenance.py rebuild-rollups        # sales rollups from order_items (recorded prices and categories)
+#   python maintenance.py retotal-orders [--fix] # check stored order totals against their lines
+#
+# Migrations (database/migrations.py) run these once when upgrading; the commands
+# are here to repeat them, e.g. after importing old orders.
+import argparse
+import logging
+
+from crud import crud_analytics, crud_order
+from database import database, migrations, models
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def backfill_order_lines(db, args) -> None:
+    updated = crud_order.backfill_order_item_snapshots(db)
+    categorized = crud_order.backfill_order_item_categories(db)
+    db.commit()
+    logger.info(f"Backfilled the price and name of {updated} and the category of {categorized} order lines.")
+
+def rebuild_rollups(db, args) -> None:
+    crud_analytics.rebuild_rollups(db)
+    db.commit()
+    logger.info("Sales rollups rebuilt.")
+
+def retotal_orders(db, args) -> None:
+    mismatches = crud_order.retotal_orders(db, fix=args.fix)
+    for mismatch in mismatches:
+        logger.info(f"Order {mismatch.order_id}: stored total {mismatch.stored}, lines add up to {mismatch.computed}")
+    if args.fix:
+        db.commit()
+        logger.info(f"Fixed {len(mismatches)} order totals.")
+    else:
+        logger.info(f"{len(mismatches)} order totals do not match their lines (rerun with --fix to correct them).")
+
+COMMANDS = {
+    "backfill-order-lines": backfill_order_lines,
+    "rebuild-rollups": rebuild_rollups,
+    "retotal-orders": retotal_orders,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Data maintenance tasks")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--fix", action="store_true", help="retotal-orders: overwrite the mismatching totals")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=database.engine)
+    migrations.run_migrations(database.engine)
+    db = database.SessionLocal()
+    try:
+        COMMANDS[args.command](db, args)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# backend/schemas/analytics.py
+from datetime import date
+from pydantic import BaseModel
+from typing import Optional
+
+from core.money import MoneyTotal
+
+class TopSeller(BaseModel):
+    menu_item_id: str
+    name: Optional[str] = None # None once the menu item has been deleted
+    units: int
+    revenue: MoneyTotal
+    orders: int
+
+    class Config:
+        from_attributes = True
+
+class CategoryRevenue(BaseModel):
+    category: str
+    units: int
+    revenue: MoneyTotal
+    orders: int
+
+    class Config:
+        from_attributes = True
+
+class DailyRevenue(BaseModel):
+    day: date
+    units: int
+    revenue: MoneyTotal
+
+    class Config:
+        from_attributes = True
@@ -1,12 +1,14 @@
 # backend/schemas/menu.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+
+from core.money import Money
 
 # Base model for MenuItem, used for creation and updates
 class MenuItemBase(BaseModel):
     name: str
     description: Optional[str] = None
-    price: float
+    price: Money
     category: str
     imageUrl: Optional[str] = None
 
@@ -19,7 +21,7 @@ class MenuItemCreate(MenuItemBase):
 class MenuItemUpdate(MenuItemBase):
     name: Optional[str] = None
     description: Optional[str] = None
-    price: Optional[float] = None
+    price: Optional[Money] = None
     category: Optional[str] = None
     imageUrl: Optional[str] = None
 
@@ -29,3 +31,18 @@ class MenuItem(MenuItemBase):
 
     class Config:
         from_attributes = True # Pydantic v2, replaces orm_mode
+
+# Schema for search-box suggestions (GET /menu/suggest)
+class MenuSuggestion(BaseModel):
+    text: str # Item name or category, as displayed
+    kind: str # "item" or "category"
+    id: Optional[str] = None # Menu item ID when kind is "item"
+
+# Result of a bulk import (POST /menu/import): ids per outcome
+class MenuImportResult(BaseModel):
+    created: List[str]
+    updated: List[str]
+    deleted: List[str] # Only with replace=true
+    kept: List[str] # Missing from the catalog but not deleted: past orders reference them
+    unchanged: int
+    dry_run: bool # Nothing was written; the lists are what the import would do
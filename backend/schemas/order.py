@@ -1,6 +1,8 @@
 # backend/schemas/order.py
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from typing import List, Optional
+
+from core import money
 from .menu import MenuItem # For response model
 
 # --- OrderItem Schemas ---
@@ -17,6 +19,15 @@ class OrderItemUpdate(OrderItemBase):
 class OrderItem(OrderItemBase):
     id: int
     # menu_item: MenuItem # Optionally include full menu item details
+    # Price and name when the order was placed (None only for lines of deleted menu items
+    # in orders placed before these were recorded)
+    unit_price: Optional[money.Money] = None
+    name: Optional[str] = None
+
+    @computed_field
+    @property
+    def line_total(self) -> Optional[money.MoneyTotal]:
+        return money.line_total(self.unit_price, self.quantity)
 
     class Config:
         from_attributes = True
@@ -37,7 +48,7 @@ class OrderUpdate(OrderBase):
 class Order(OrderBase):
     id: int
     user_id: int
-    total_price: float
+    total_price: money.MoneyTotal
     items: List[OrderItem]
 
     class Config:
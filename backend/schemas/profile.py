@@ -0,0 +1,14 @@
+# backend/schemas/profile.py
+from datetime import datetime
+from pydantic import BaseModel
+
+class Profile(BaseModel):
+    id: str
+    method: str
+    path: str
+    route: str # Route template, e.g. "/api/v1/orders/{order_id}"
+    status: int
+    started_at: datetime
+    duration_ms: float
+    interval_ms: float
+    samples: int
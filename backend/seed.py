@@ -1,9 +1,18 @@
 # backend/seed.py
+import argparse
+import itertools
 import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Boolean, DateTime, Integer, String, column, func, select, table, text
 from sqlalchemy.orm import Session
 
-from database import database, models
-from crud import crud_menu, crud_user
+from database import database, migrations, models
+from core import security
+from crud import crud_analytics, crud_menu, crud_user
 from schemas import menu as menu_schemas
 from schemas import user as user_schemas
 from core.config import settings # For any config needed during seeding
@@ -96,17 +105,262 @@ def init_db(db: Session):
     # Create tables. This is also in main.py, but can be useful here for standalone seeding.
     # In a production setup, Alembic would handle migrations.
     models.Base.metadata.create_all(bind=database.engine)
+    migrations.run_migrations(database.engine)
     
     seed_menu_items(db)
     seed_initial_user(db) # Optional: seed an initial admin user
 
+# --- Bulk mode: synthetic data at production scale ---
+# python seed.py --bulk --users 100000 --menu-items 500 --orders 10000000
+#
+# Rows go in through Core insert() executemany, BULK_BATCH_SIZE orders (and their
+# lines) per transaction, with ids assigned here so lines need no RETURNING. The
+# tables below are untyped stand-ins for the models' tables: money columns take
+# integer cents as they are stored, instead of going through models.Cents per row.
+# The secondary indexes of orders and order_items are dropped for the load and built
+# once at the end, also when the load fails; a run killed outright leaves them out,
+# so every bulk run starts by creating the models' missing indexes. The sales
+# rollups are rebuilt from the new lines.
+
+BULK_USER_PASSWORD = "bulkpassword" # Shared by every generated user: bcrypt runs once
+BULK_BATCH_SIZE = 20000
+
+# Category -> price range (cents) of the generated menu
+BULK_CATEGORIES = {
+    "Pizzas Tradicionais": (2800, 4500),
+    "Pizzas Especiais": (3800, 6500),
+    "Pizzas Doces": (3000, 5000),
+    "Bebidas": (300, 1500),
+    "Sobremesas": (800, 2500),
+    "Porções": (1800, 4000),
+}
+# Relative weights: lines per order (1-6), quantity per line (1-3), weekday (Monday
+# first) and hour of the day (UTC; lunch and dinner peaks)
+LINES_PER_ORDER_WEIGHTS = [30, 30, 20, 10, 6, 4]
+QUANTITY_WEIGHTS = [75, 20, 5]
+WEEKDAY_WEIGHTS = [0.9, 0.85, 0.9, 1.0, 1.3, 1.5, 1.4]
+HOUR_WEIGHTS = [1, 0.5, 0.2, 0.1, 0.1, 0.1, 0.2, 0.4, 0.8, 1, 2, 5, 8, 6, 3, 2, 2, 3, 6, 9, 10, 8, 5, 2]
+
+_users = table(
+    "users", column("id", Integer), column("email", String), column("hashed_password", String),
+    column("is_active", Boolean),
+)
+_menu_items = table(
+    "menu_items", column("id", String), column("name", String), column("description", String),
+    column("price", Integer), column("category", String),
+)
+_orders = table(
+    "orders", column("id", Integer), column("user_id", Integer), column("total_price", Integer),
+    column("created_at", DateTime),
+)
+_order_items = table(
+    "order_items", column("id", Integer), column("order_id", Integer), column("menu_item_id", String),
+    column("quantity", Integer), column("unit_price", Integer), column("name", String), column("category", String),
+)
+
+def _zipf_cum_weights(count: int, exponent: float, rng: random.Random) -> List[float]:
+    # Popularity by rank (a few items/users get most of the orders), ranks shuffled
+    weights = [1 / (rank + 1) ** exponent for rank in range(count)]
+    rng.shuffle(weights)
+    return list(itertools.accumulate(weights))
+
+def _next_id(connection, model) -> int:
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+def _bulk_menu(connection, count: int, rng: random.Random) -> None:
+    existing = set(connection.execute(select(_menu_items.c.id)).scalars())
+    rows = []
+    for i in range(count):
+        category = rng.choice(list(BULK_CATEGORIES))
+        low, high = BULK_CATEGORIES[category]
+        item_id = f"bulk-{i:06d}"
+        if item_id not in existing:
+            rows.append({
+                "id": item_id, "name": f"{category} {i}", "description": f"Item {i} gerado para testes de carga.",
+                "price": rng.randrange(low, high + 1, 50), "category": category,
+            })
+    if rows:
+        connection.execute(_menu_items.insert(), rows)
+
+def _bulk_users(connection, count: int) -> List[int]:
+    first_id = _next_id(connection, models.User)
+    hashed_password = security.get_password_hash(BULK_USER_PASSWORD)
+    rows = [
+        {"id": user_id, "email": f"bulk-{user_id}@example.com", "hashed_password": hashed_password, "is_active": True}
+        for user_id in range(first_id, first_id + count)
+    ]
+    for start in range(0, len(rows), BULK_BATCH_SIZE):
+        connection.execute(_users.insert(), rows[start:start + BULK_BATCH_SIZE])
+    return [row["id"] for row in rows]
+
+def _order_times(orders: int, days: int, rng: random.Random):
+    """`orders` UTC timestamps over the `days` days before today, in ascending order."""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    first_day = today - timedelta(days=days)
+    # Weekly pattern, on a trend growing to twice the volume of the first day
+    day_weights = [
+        WEEKDAY_WEIGHTS[(first_day + timedelta(days=day)).weekday()] * (1 + day / max(days - 1, 1))
+        for day in range(days)
+    ]
+    total_weight = sum(day_weights)
+    hours = range(24)
+    cumulative, placed = 0.0, 0
+    for day, weight in enumerate(day_weights):
+        cumulative += weight
+        count = round(orders * cumulative / total_weight) - placed
+        placed += count
+        start = first_day + timedelta(days=day)
+        seconds = sorted(
+            hour * 3600 + rng.random() * 3600 for hour in rng.choices(hours, HOUR_WEIGHTS, k=count)
+        )
+        for second in seconds:
+            yield start + timedelta(seconds=second)
+
+def _bulk_orders(connection, user_ids: List[int], orders: int, days: int, rng: random.Random) -> int:
+    menu = connection.execute(
+        select(_menu_items.c.id, _menu_items.c.price, _menu_items.c.name, _menu_items.c.category)
+    ).all()
+    menu_rows: List[Tuple[str, int, str, str]] = [
+        (item_id, int(round(price)), name, category) for item_id, price, name, category in menu
+    ]
+    menu_weights = _zipf_cum_weights(len(menu_rows), 1.0, rng)
+    user_weights = _zipf_cum_weights(len(user_ids), 0.7, rng)
+    line_counts = range(1, len(LINES_PER_ORDER_WEIGHTS) + 1)
+    line_count_weights = list(itertools.accumulate(LINES_PER_ORDER_WEIGHTS))
+    quantities = range(1, len(QUANTITY_WEIGHTS) + 1)
+    quantity_weights = list(itertools.accumulate(QUANTITY_WEIGHTS))
+
+    order_id = _next_id(connection, models.Order)
+    line_id = _next_id(connection, models.OrderItem)
+    order_rows: List[Dict] = []
+    line_rows: List[Dict] = []
+    done = rows = 0
+    started = time.perf_counter()
+
+    def flush():
+        nonlocal done, rows
+        connection.execute(_orders.insert(), order_rows)
+        connection.execute(_order_items.insert(), line_rows)
+        connection.commit()
+        done += len(order_rows)
+        rows += len(order_rows) + len(line_rows)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"{done:,}/{orders:,} orders, {rows:,} rows, {rows / elapsed:,.0f} rows/s, "
+            f"ETA {elapsed / done * (orders - done):,.0f} s"
+        )
+        order_rows.clear()
+        line_rows.clear()
+
+    for created_at in _order_times(orders, days, rng):
+        total = 0
+        # Distinct items per order; repeats of an item go in its quantity
+        lines = rng.choices(line_counts, cum_weights=line_count_weights)[0]
+        for item_id, price, name, category in set(rng.choices(menu_rows, cum_weights=menu_weights, k=lines)):
+            quantity = rng.choices(quantities, cum_weights=quantity_weights)[0]
+            total += price * quantity
+            line_rows.append({
+                "id": line_id, "order_id": order_id, "menu_item_id": item_id, "quantity": quantity,
+                "unit_price": price, "name": name, "category": category,
+            })
+            line_id += 1
+        order_rows.append({
+            "id": order_id, "user_id": rng.choices(user_ids, cum_weights=user_weights)[0],
+            "total_price": total, "created_at": created_at,
+        })
+        order_id += 1
+        if len(order_rows) >= BULK_BATCH_SIZE:
+            flush()
+    if order_rows:
+        flush()
+    return rows
+
+def _ensure_indexes(connection) -> None:
+    # Migrations only add an index once, and create_all skips existing tables
+    for model_table in models.Base.metadata.sorted_tables:
+        for index in model_table.indexes:
+            index.create(connection, checkfirst=True)
+
+def _reset_sequences(connection) -> None:
+    # Ids were assigned here, so PostgreSQL's serial sequences did not advance
+    for table_name in ("users", "orders", "order_items"):
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), (SELECT max(id) FROM {table_name}))"
+        ))
+
+def bulk_seed(users: int, menu_items: int, orders: int, days: int, seed: int, keep_indexes: bool = False) -> None:
+    rng = random.Random(seed)
+    deferred = [] if keep_indexes else [
+        index for model in (models.Order, models.OrderItem) for index in model.__table__.indexes
+    ]
+    started = time.perf_counter()
+    with database.engine.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # Bulk-load settings, for this connection only: no fsync per commit (a
+            # crash can corrupt the file; seed a copy), larger page cache
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+            connection.exec_driver_sql("PRAGMA temp_store = MEMORY")
+            connection.exec_driver_sql("PRAGMA cache_size = -262144")
+        _ensure_indexes(connection) # Those a killed run left out
+        for index in deferred:
+            index.drop(connection, checkfirst=True)
+        connection.commit()
+        try:
+            _bulk_menu(connection, menu_items, rng)
+            user_ids = _bulk_users(connection, users)
+            connection.commit()
+            logger.info(f"{menu_items:,} menu items and {users:,} users in {time.perf_counter() - started:.1f} s")
+
+            rows = _bulk_orders(connection, user_ids, orders, days, rng)
+            if connection.dialect.name == "postgresql":
+                _reset_sequences(connection)
+            connection.commit()
+        except BaseException:
+            connection.rollback() # The failed batch; the committed ones stay
+            raise
+        finally:
+            loaded = time.perf_counter() - started
+            for index in deferred:
+                index.create(connection, checkfirst=True)
+            connection.commit()
+            logger.info(f"Indexes built in {time.perf_counter() - started - loaded:.1f} s")
+            connection.invalidate() # Do not hand the bulk-load pragmas back to the pool
+
+    rollups_started = time.perf_counter()
+    db = database.SessionLocal()
+    try:
+        crud_analytics.rebuild_rollups(db)
+        db.commit()
+    finally:
+        db.close()
+    logger.info(f"Sales rollups rebuilt in {time.perf_counter() - rollups_started:.1f} s")
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Bulk seeding finished: {rows:,} order and line rows in {loaded:.1f} s ({rows / loaded:,.0f} rows/s), "
+        f"{elapsed:.1f} s in total"
+    )
+
 def main():
+    parser = argparse.ArgumentParser(description="Seed the database")
+    parser.add_argument("--bulk", action="store_true", help="also generate synthetic users, menu items and orders")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--menu-items", type=int, default=300)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=365, help="orders are spread over the N days before today")
+    parser.add_argument("--seed", type=int, default=1, help="random seed: the same seed generates the same data")
+    parser.add_argument(
+        "--keep-indexes", action="store_true", help="load with the order indexes in place (slower; for a live database)"
+    )
+    args = parser.parse_args()
+
     logger.info("Starting database seeding process...")
     db = database.SessionLocal()
     try:
         init_db(db)
     finally:
         db.close()
+    if args.bulk:
+        bulk_seed(args.users, args.menu_items, args.orders, args.days, args.seed, keep_indexes=args.keep_indexes)
     logger.info("Database seeding process finished.")
 
 if __name__ == "__main__":